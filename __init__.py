@@ -8,16 +8,21 @@ if "bpy" in locals():
 else:
     import bpy
 
-    from . import essentials, operators, ui
+    from . import cli, essentials, operators, preferences, ui
+    from .lib import deps, fingerprint, plan
 
 
-classes = essentials.get_classes((operators, ui))
+classes = essentials.get_classes((operators, preferences, ui))
 
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    deps.register()
+    fingerprint.register()
+    plan.register()
+
     # Menu
     # ---------------------------
 
@@ -26,11 +31,20 @@ def register():
     bpy.types.OUTLINER_MT_object.append(ui.draw_messythings_menu)
     bpy.types.OUTLINER_MT_context_menu.append(ui.draw_messythings_menu)
 
+    # Command line
+    # ---------------------------
+
+    cli.register()
+
 
 def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
 
+    deps.unregister()
+    fingerprint.unregister()
+    plan.unregister()
+
     # Menu
     # ---------------------------
 
@@ -39,6 +53,11 @@ def unregister():
     bpy.types.OUTLINER_MT_object.remove(ui.draw_messythings_menu)
     bpy.types.OUTLINER_MT_context_menu.remove(ui.draw_messythings_menu)
 
+    # Command line
+    # ---------------------------
+
+    cli.unregister()
+
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,281 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+from .lib import batch, bench, cache, worker
+
+
+_handle = None
+
+
+def _ops_arg(value: str) -> dict[str, dict]:
+    ops = json.loads(Path(value).read_text(encoding="utf-8") if value.endswith(".json") else value)
+
+    if not isinstance(ops, dict):
+        raise argparse.ArgumentTypeError("operators must be a JSON object")
+
+    for name in ops:
+        if name not in batch.OPERATORS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operator '{name}', expected one of: {', '.join(batch.OPERATORS)}"
+            )
+
+    return ops
+
+
+# Commands
+# ---------------------------
+
+
+def _batch(args: argparse.Namespace) -> int:
+    root = args.path.resolve()
+    files = batch.find_files(root, args.recursive)
+    if root.is_file():
+        root = root.parent
+
+    if not files:
+        print(f"No .blend files found in {root}", file=sys.stderr)
+        return 1
+
+    report = args.report or (args.output or root) / "messythings_results.jsonl"
+    report.parent.mkdir(parents=True, exist_ok=True)
+    failed = 0
+
+    if args.profile:
+        os.environ["MESSYTHINGS_PROFILE"] = "1"  # Inherited by worker processes
+
+    time_start = time.perf_counter()
+    skipped = []
+
+    if args.scan:
+        files, skipped = batch.triage(files, args.jobs * 2)
+        time_scan = time.perf_counter() - time_start
+        print(f"Scanned in {time_scan:.1f} s, {len(skipped)} files skipped", file=sys.stderr)
+
+    results_cache = None
+    digests = {}
+
+    if args.cache:
+        results_cache = cache.Cache(args.cache, args.ops)
+        save_paths = None
+        if args.output:
+            save_paths = {filepath: args.output / filepath.relative_to(root) for filepath in files}
+        digests, hits = results_cache.split(files, args.jobs * 2, save_paths)
+        files = [filepath for filepath in files if str(filepath) in digests]
+        skipped += hits
+
+    if args.warm:
+        records = worker.run_pool(files, args.ops, root, args.output, args.jobs, args.timeout, args.max_jobs)
+    else:
+        records = batch.run_batch(files, args.ops, root, args.output, args.jobs, args.timeout)
+
+    with open(report, "w", encoding="utf-8") as fp:
+        for record in skipped:
+            batch.write_record(fp, record)
+            if not record["ok"]:
+                failed += 1
+
+        for record in records:
+            batch.write_record(fp, record)
+            if not record["ok"]:
+                failed += 1
+            elif results_cache is not None:
+                save_path = None if args.output else Path(record["file"])
+                results_cache.store(digests[record["file"]], record, save_path)
+
+    if results_cache is not None:
+        results_cache.close()
+        print(f"Cache: {results_cache.hits} hits, {results_cache.misses} misses", file=sys.stderr)
+
+    time_total = time.perf_counter() - time_start
+    print(
+        f"Processed {len(files)} files, {len(skipped)} skipped, {failed} failed in {time_total:.1f} s "
+        f"({len(files) / time_total * 60:.1f} files/min), results: {report}"
+    )
+
+    return 1 if failed else 0
+
+
+def _process(args: argparse.Namespace) -> int:
+    record = batch.process_file(args.file, args.ops, args.save_as or args.file)
+    args.result.write_text(json.dumps(record), encoding="utf-8")
+    return 0 if record["ok"] else 1
+
+
+def _cache(args: argparse.Namespace) -> int:
+    if args.clear:
+        count = cache.clear(args.cache, args.files or None)
+        print(f"Removed {count} cache entries")
+    else:
+        info = cache.stats(args.cache)
+        print(
+            f"{args.cache}: {info['entries']} entries for {info['files']} files, "
+            f"add-on version {cache.ADDON_VERSION}"
+        )
+    return 0
+
+
+def _worker(args: argparse.Namespace) -> int:
+    return worker.serve(args.queue, args.max_jobs, args.idle_timeout)
+
+
+def _bench(args: argparse.Namespace) -> int:
+    if args.profile:
+        os.environ["MESSYTHINGS_PROFILE"] = "1"
+
+    results = []
+
+    for result in bench.run(args.objects, args.ops, args.repeat, args.seed):
+        results.append(result)
+        for name, op in result["operators"].items():
+            print(
+                f"{result['objects']:>7} objects  {name:<14} "
+                f"min {op['min']:.3f} s  median {op['median']:.3f} s",
+                file=sys.stderr,
+            )
+
+    report = {
+        "blender": bpy.app.version_string,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=1), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=1))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if regressions := bench.compare(results, baseline["results"], args.threshold):
+            for line in regressions:
+                print(f"REGRESSION {line}", file=sys.stderr)
+            return 1
+        print(f"No regressions over {args.threshold:.0%} threshold against {args.baseline}", file=sys.stderr)
+
+    return 0
+
+
+# Parser
+# ---------------------------
+
+
+def _parser() -> argparse.ArgumentParser:
+    ops_help = (
+        "JSON object or path to .json file mapping operators to their properties, "
+        f"operators: {', '.join(batch.OPERATORS)}"
+    )
+
+    parser = argparse.ArgumentParser(prog="blender --command messythings")
+    subparsers = parser.add_subparsers(required=True)
+
+    p = subparsers.add_parser("batch", help="Process directory of .blend files in parallel Blender processes")
+    p.add_argument("path", type=Path, help="Directory or .blend file")
+    p.add_argument("-o", "--output", type=Path, help="Save processed files to directory instead of overwriting")
+    p.add_argument("-r", "--recursive", action="store_true", help="Search subdirectories")
+    p.add_argument("-j", "--jobs", type=int, default=4, help="Number of parallel Blender processes")
+    p.add_argument("-t", "--timeout", type=float, default=300.0, help="Time limit per file in seconds")
+    p.add_argument("--ops", type=_ops_arg, default={"scene_cleanup": {}}, help=ops_help)
+    p.add_argument("--report", type=Path, help="Path to JSON Lines result file")
+    p.add_argument(
+        "-w",
+        "--warm",
+        action="store_true",
+        help="Reuse worker processes for many files instead of starting one per file",
+    )
+    p.add_argument("--max-jobs", type=int, default=50, help="Restart warm worker after processing this many files")
+    p.add_argument("--profile", action="store_true", help="Add per-phase operator stats to result records")
+    p.add_argument(
+        "--scan",
+        action="store_true",
+        help="Read files without Blender first, skip unreadable files and files without objects",
+    )
+    p.add_argument(
+        "--cache",
+        type=Path,
+        nargs="?",
+        const=cache.default_path(),
+        help=(
+            "Skip files with successful result for same content, add-on version and operators, "
+            "optional path to SQLite database"
+        ),
+    )
+    p.set_defaults(func=_batch)
+
+    p = subparsers.add_parser("cache", help="Show or invalidate batch result cache")
+    p.add_argument("files", type=Path, nargs="*", help="Invalidate only entries of these files")
+    p.add_argument("--clear", action="store_true", help="Remove entries, all of them if no files are given")
+    p.add_argument("--cache", type=Path, default=cache.default_path(), help="Path to SQLite database")
+    p.set_defaults(func=_cache)
+
+    p = subparsers.add_parser(
+        "bench",
+        help="Time operators on procedurally generated scenes, compare against baseline",
+    )
+    p.add_argument(
+        "-n",
+        "--objects",
+        type=int,
+        nargs="+",
+        default=[10_000],
+        help="Scene sizes in number of objects",
+    )
+    p.add_argument("--ops", type=_ops_arg, default={name: {} for name in batch.OPERATORS}, help=ops_help)
+    p.add_argument("--repeat", type=int, default=3, help="Number of timed runs per operator and scene size")
+    p.add_argument("--seed", type=int, default=0, help="Random seed of scene generator")
+    p.add_argument("-o", "--output", type=Path, help="Write JSON results to file instead of stdout")
+    p.add_argument("--baseline", type=Path, help="JSON results of previous run, exit with error on regression")
+    p.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown ratio against baseline")
+    p.add_argument("--profile", action="store_true", help="Add per-phase operator stats to results")
+    p.set_defaults(func=_bench)
+
+    p = subparsers.add_parser("process", help="Process single .blend file in current Blender process")
+    p.add_argument("file", type=Path)
+    p.add_argument("--ops", type=_ops_arg, default={"scene_cleanup": {}}, help=ops_help)
+    p.add_argument("--save-as", type=Path)
+    p.add_argument("--result", type=Path, required=True)
+    p.set_defaults(func=_process)
+
+    p = subparsers.add_parser(
+        "worker",
+        help="Serve jobs from file-drop queue directory, keeping Blender and add-on loaded",
+    )
+    p.add_argument(
+        "queue",
+        type=Path,
+        help="Queue directory, *.job files are claimed and *.result files written next to them",
+    )
+    p.add_argument("--max-jobs", type=int, default=0, help="Exit after processing this many jobs, 0 for unlimited")
+    p.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=0.0,
+        help="Exit after being idle for this many seconds, 0 to wait forever",
+    )
+    p.set_defaults(func=_worker)
+
+    return parser
+
+
+def execute(argv: list[str]) -> int:
+    args = _parser().parse_args(argv)
+    return args.func(args)
+
+
+def register() -> None:
+    global _handle
+    _handle = bpy.utils.register_cli_command("messythings", execute)
+
+
+def unregister() -> None:
+    bpy.utils.unregister_cli_command(_handle)
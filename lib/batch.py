@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import bpy
+
+from . import blendfile, profiler
+
+
+OPERATORS = {
+    "scene_cleanup": "scene.messythings_scene_cleanup",
+    "normalize": "scene.messythings_normalize",
+    "obdata_del": "object.messythings_obdata_del",
+    "sort": "scene.messythings_sort",
+    "mesh_dedupe": "scene.messythings_mesh_dedupe",
+    "material_dedupe": "scene.messythings_material_dedupe",
+    "image_audit": "scene.messythings_image_audit",
+}
+
+_counted_data = (
+    "objects",
+    "meshes",
+    "curves",
+    "lattices",
+    "materials",
+    "grease_pencils",
+    "collections",
+)
+
+
+def data_counts() -> dict[str, int]:
+    return {name: len(getattr(bpy.data, name)) for name in _counted_data}
+
+
+def op_call(idname: str, props: dict) -> set[str]:
+    module, name = idname.split(".")
+    op = getattr(getattr(bpy.ops, module), name)
+    return op("EXEC_DEFAULT", **props)
+
+
+def _select_all(state: bool) -> None:
+    for ob in bpy.context.view_layer.objects:
+        if ob.select_get() is not state:
+            ob.select_set(state)
+
+
+def select_for(name: str) -> None:
+    # Object data stripping works on selection, the rest on the whole scene when nothing is selected
+    _select_all(name == "obdata_del")
+
+
+def run_ops(ops: dict[str, dict]) -> dict[str, list[str]]:
+    statuses = {}
+
+    for name, props in ops.items():
+        select_for(name)
+        statuses[name] = sorted(op_call(OPERATORS[name], props))
+
+    return statuses
+
+
+# Worker
+# ---------------------------
+
+
+def process_file(filepath: Path, ops: dict[str, dict], save_path: Path) -> dict:
+    """Runs inside worker process, file is opened, processed and saved"""
+    record = {"file": str(filepath), "ok": False, "error": None}
+    profiler.last_run.clear()
+    time_start = time.perf_counter()
+
+    try:
+        bpy.ops.wm.open_mainfile(filepath=str(filepath), load_ui=False)
+        record["before"] = data_counts()
+        record["operators"] = run_ops(ops)
+        record["after"] = data_counts()
+
+        if profiler.is_enabled():
+            record["stats"] = {name: profiler.last_run.get(OPERATORS[name]) for name in ops}
+
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        bpy.ops.wm.save_as_mainfile(filepath=str(save_path))
+
+        record["ok"] = True
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["time"] = round(time.perf_counter() - time_start, 3)
+
+    return record
+
+
+# Driver
+# ---------------------------
+
+
+def find_files(path: Path, recursive: bool = False) -> list[Path]:
+    if path.is_file():
+        return [path]
+    pattern = "**/*.blend" if recursive else "*.blend"
+    return sorted(path.glob(pattern))
+
+
+def _scan(filepath: Path) -> blendfile.BlendInfo | Exception:
+    try:
+        return blendfile.scan(filepath)
+    except Exception as e:  # Corrupt compressed data raises decompressor specific errors
+        return e
+
+
+def triage(files: list[Path], jobs: int = 8) -> tuple[list[Path], list[dict]]:
+    """Read ID blocks without opening files in Blender,
+    skip files which are not readable .blend files or have no objects
+
+    :return: Files to process, records of skipped files
+    """
+    kept = []
+    skipped = []
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for filepath, info in zip(files, executor.map(_scan, files)):
+            record = {"file": str(filepath), "ok": True, "error": None, "time": 0.0}
+
+            if isinstance(info, blendfile.DecompressorMissing):
+                kept.append(filepath)  # Compressed file which can not be decompressed without Blender
+            elif isinstance(info, Exception):
+                record["ok"] = False
+                record["error"] = f"Scan: {type(info).__name__}: {info}"
+                skipped.append(record)
+            elif not info.ids.get("objects"):
+                record["skipped"] = "No objects"
+                record["before"] = info.counts()
+                skipped.append(record)
+            else:
+                kept.append(filepath)
+
+    return kept, skipped
+
+
+def _run_worker(filepath: Path, ops: dict[str, dict], save_path: Path, result_path: Path, timeout: float) -> dict:
+    cmd = (
+        bpy.app.binary_path,
+        "--background",
+        "--command", "messythings", "process", str(filepath),
+        "--ops", json.dumps(ops),
+        "--save-as", str(save_path),
+        "--result", str(result_path),
+    )
+    time_start = time.perf_counter()
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"file": str(filepath), "ok": False, "error": f"Timed out after {timeout} s", "time": timeout}
+
+    if result_path.exists():
+        return json.loads(result_path.read_text(encoding="utf-8"))
+
+    # Worker crashed before writing result
+    stderr = proc.stderr.strip().splitlines()[-5:]
+    return {
+        "file": str(filepath),
+        "ok": False,
+        "error": f"Exit code {proc.returncode}: " + " | ".join(stderr),
+        "time": round(time.perf_counter() - time_start, 3),
+    }
+
+
+def run_batch(
+    files: list[Path],
+    ops: dict[str, dict],
+    root: Path,
+    output: Path | None = None,
+    jobs: int = 4,
+    timeout: float = 300.0,
+) -> Iterator[dict]:
+    """Process files in separate Blender processes,
+    yield result records in order of completion"""
+    with tempfile.TemporaryDirectory() as tmp, ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+
+        for i, filepath in enumerate(files):
+            save_path = filepath if output is None else output / filepath.relative_to(root)
+            result_path = Path(tmp) / f"{i}.json"
+            futures.append(executor.submit(_run_worker, filepath, ops, save_path, result_path, timeout))
+
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_record(fp, record: dict) -> None:
+    fp.write(json.dumps(record) + "\n")
+    fp.flush()
+    print(("OK  " if record["ok"] else "ERR ") + record["file"], record["error"] or "", file=sys.stderr)
@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+import statistics
+import time
+from collections.abc import Iterator
+
+import bpy
+from bpy.types import Collection, Material, Mesh, Object
+
+from . import batch, profiler
+
+
+# Timings below this are dominated by noise and never reported as regressions
+NOISE_FLOOR = 0.01
+
+
+# Scene generator
+# ---------------------------
+
+
+def _cube(name: str) -> Mesh:
+    me = bpy.data.meshes.new(name)
+    verts = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    me.from_pydata(verts, (), faces)
+    return me
+
+
+def _node_group() -> bpy.types.NodeTree:
+    ng = bpy.data.node_groups.new("Bench Nodes", "GeometryNodeTree")
+    ng.interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+    ng.interface.new_socket("Object", in_out="INPUT", socket_type="NodeSocketObject")
+    ng.interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+
+    node_in = ng.nodes.new("NodeGroupInput")
+    node_info = ng.nodes.new("GeometryNodeObjectInfo")
+    node_join = ng.nodes.new("GeometryNodeJoinGeometry")
+    node_out = ng.nodes.new("NodeGroupOutput")
+
+    ng.links.new(node_in.outputs["Object"], node_info.inputs["Object"])
+    ng.links.new(node_in.outputs["Geometry"], node_join.inputs[0])
+    ng.links.new(node_info.outputs["Geometry"], node_join.inputs[0])
+    ng.links.new(node_join.outputs[0], node_out.inputs[0])
+
+    return ng
+
+
+def _link(colls: list[Collection], ob: Object, rng: random.Random) -> Object:
+    rng.choice(colls).objects.link(ob)
+    return ob
+
+
+def generate(count: int, seed: int = 0) -> dict[str, int]:
+    """Populate current scene with procedural mess of roughly count objects:
+    shared meshes, empty meshes, Geometry Nodes modifiers with and without node group,
+    curves with bevel objects, gem-tagged instancers, subdivision and many material slots"""
+    rng = random.Random(seed)
+    scene = bpy.context.scene
+
+    # Collections
+    colls = [scene.collection]
+    for i in range(max(4, count // 500)):
+        coll = bpy.data.collections.new(f"Collection {i}")
+        rng.choice(colls).children.link(coll)
+        colls.append(coll)
+    for i in range(max(2, count // 2000)):
+        rng.choice(colls).children.link(bpy.data.collections.new(f"Empty {i}"))
+
+    mats: list[Material] = [bpy.data.materials.new(f"Material {i}") for i in range(32)]
+    meshes = [_cube(f"Shared {i}") for i in range(max(1, count // 100))]
+    for me in meshes:
+        for mat in rng.sample(mats, 8):
+            me.materials.append(mat)
+        me.materials.append(None)
+
+    ng = _node_group()
+    bevel_obs = []
+    for i in range(max(1, count // 1000)):
+        cu = bpy.data.curves.new(f"Bevel {i}", "CURVE")
+        cu.splines.new("POLY").points.add(2)
+        bevel_obs.append(_link(colls, bpy.data.objects.new(f"Bevel {i}", cu), rng))
+
+    obs = []
+    gems_left = 0
+    instancer = None
+
+    for i in range(count):
+        kind = rng.random()
+
+        # Gem children of vertex instancer
+        if gems_left:
+            ob = _link(colls, bpy.data.objects.new(f"Gem {i}", meshes[0]), rng)
+            ob["gem"] = {"type": "ROUND", "stone": "DIAMOND"}
+            ob.parent = instancer
+            gems_left -= 1
+
+        elif kind < 0.4:
+            ob = _link(colls, bpy.data.objects.new(f"Mesh {i}", rng.choice(meshes)), rng)
+            if rng.random() < 0.2:
+                ob.modifiers.new("Subdivision", "SUBSURF").levels = rng.randint(1, 4)
+            if rng.random() < 0.1:
+                ob.vertex_groups.new(name="Group")
+
+        elif kind < 0.45:
+            ob = _link(colls, bpy.data.objects.new(f"Empty Mesh {i}", bpy.data.meshes.new(f"Empty Mesh {i}")), rng)
+
+        elif kind < 0.55:
+            ob = _link(colls, bpy.data.objects.new(f"Nodes {i}", rng.choice(meshes)), rng)
+            mod = ob.modifiers.new("GeometryNodes", "NODES")
+            if rng.random() < 0.8:
+                mod.node_group = ng
+                if obs:
+                    mod[ng.interface.items_tree["Object"].identifier] = rng.choice(obs)
+
+        elif kind < 0.65:
+            cu = bpy.data.curves.new(f"Curve {i}", "CURVE")
+            cu.splines.new("BEZIER").bezier_points.add(1)
+            if rng.random() < 0.7:
+                cu.bevel_mode = "OBJECT"
+                cu.bevel_object = rng.choice(bevel_obs)
+            ob = _link(colls, bpy.data.objects.new(f"Curve {i}", cu), rng)
+
+        elif kind < 0.67:
+            instancer = _link(colls, bpy.data.objects.new(f"Instancer {i}", rng.choice(meshes)), rng)
+            instancer.instance_type = "VERTS"
+            ob = instancer
+            gems_left = rng.randint(1, 20)
+
+        elif kind < 0.9:
+            ob = _link(colls, bpy.data.objects.new(f"Empty {i}", None), rng)
+
+        else:
+            light = bpy.data.lights.new(f"Light {i}", "POINT")
+            ob = _link(colls, bpy.data.objects.new(f"Light {i}", light), rng)
+
+        obs.append(ob)
+
+    return batch.data_counts()
+
+
+def reset() -> None:
+    bpy.ops.wm.read_homefile(use_empty=True, use_factory_startup=True)
+
+
+# Runner
+# ---------------------------
+
+
+def run(counts: list[int], ops: dict[str, dict], repeat: int = 3, seed: int = 0) -> Iterator[dict]:
+    """Time every operator on freshly generated scene of each size,
+    scene is regenerated before every run since operators modify it"""
+    for count in counts:
+        result = {"objects": count, "generate": None, "data": None, "operators": {}}
+
+        for name, props in ops.items():
+            times = []
+            stats = None
+
+            for _ in range(repeat):
+                reset()
+                time_start = time.perf_counter()
+                result["data"] = generate(count, seed)
+                result["generate"] = round(time.perf_counter() - time_start, 3)
+
+                batch.select_for(name)
+                time_start = time.perf_counter()
+                batch.op_call(batch.OPERATORS[name], props)
+                times.append(round(time.perf_counter() - time_start, 4))
+
+                stats = profiler.last_run.get(batch.OPERATORS[name], stats)
+
+            result["operators"][name] = {
+                "times": times,
+                "min": min(times),
+                "median": statistics.median(times),
+                "stats": stats,
+            }
+
+        yield result
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """:return: Regressions where best time exceeds baseline best time by more than threshold ratio"""
+    base = {(r["objects"], name): op["min"] for r in baseline for name, op in r["operators"].items()}
+    regressions = []
+
+    for r in results:
+        for name, op in r["operators"].items():
+            if (time_base := base.get((r["objects"], name))) is None:
+                continue
+            if op["min"] < NOISE_FLOOR and time_base < NOISE_FLOOR:
+                continue
+            if op["min"] > time_base * (1.0 + threshold):
+                regressions.append(
+                    f"{name} @ {r['objects']} objects: {op['min']:.3f} s vs {time_base:.3f} s baseline "
+                    f"(+{(op['min'] / max(time_base, 1e-9) - 1.0) * 100:.0f}%)"
+                )
+
+    return regressions
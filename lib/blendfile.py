@@ -0,0 +1,166 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Read ID block types and names from .blend file without Blender,
+file-block headers are walked without decoding DNA structs.
+
+Pure Python, can be run as script: python blendfile.py FILE [FILE ...]
+"""
+
+import gzip
+import mmap
+import struct
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+
+# ID codes to bpy.data collection names
+ID_CODES = {
+    b"OB": "objects",
+    b"ME": "meshes",
+    b"CU": "curves",
+    b"CV": "hair_curves",
+    b"LT": "lattices",
+    b"MB": "metaballs",
+    b"MA": "materials",
+    b"NT": "node_groups",
+    b"IM": "images",
+    b"TE": "textures",
+    b"GD": "grease_pencils",
+    b"GP": "grease_pencils_v3",
+    b"GR": "collections",
+    b"SC": "scenes",
+    b"LA": "lights",
+    b"CA": "cameras",
+    b"WO": "worlds",
+    b"AC": "actions",
+    b"LI": "libraries",
+    b"BR": "brushes",
+}
+
+_MAGIC_ZSTD = b"\x28\xb5\x2f\xfd"
+_MAGIC_GZIP = b"\x1f\x8b"
+
+
+class DecompressorMissing(RuntimeError):
+    pass
+
+
+class BlendInfo(NamedTuple):
+    version: int
+    compressed: str | None
+    ids: dict[str, list[str]]
+
+    def counts(self) -> dict[str, int]:
+        return {name: len(names) for name, names in self.ids.items()}
+
+
+def _decompress_zstd(data: bytes) -> bytes:
+    try:
+        from compression import zstd  # Python 3.14
+        return zstd.decompress(data)
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError:
+        raise DecompressorMissing("Reading zstd compressed files requires Python 3.14 or zstandard package") from None
+
+    # Blender writes multiple frames with seek table
+    with zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True) as reader:
+        return reader.read()
+
+
+def _header(buf) -> tuple[int, int, int, struct.Struct]:
+    """:return: Header size, version, pointer size, block header struct"""
+    if buf[:7] != b"BLENDER":
+        raise ValueError("Not a .blend file")
+
+    # Blender 5.0+: BLENDER17-01v0500
+    if buf[7:9].isdigit():
+        size = int(buf[7:9])
+        order = "<" if buf[12:13] == b"v" else ">"
+        version = int(buf[13:size])
+        # code, SDNAnr, old pointer, len, nr
+        return size, version, 8, struct.Struct(order + "4siQqq")
+
+    ptr_size = 8 if buf[7:8] == b"-" else 4
+    order = "<" if buf[8:9] == b"v" else ">"
+    version = int(buf[9:12])
+    # code, len, old pointer, SDNAnr, nr
+    return 12, version, ptr_size, struct.Struct(order + "4si" + ("Q" if ptr_size == 8 else "I") + "ii")
+
+
+def _name_offset(version: int, ptr_size: int) -> int:
+    # ID: next, prev, newid, lib, asset_data (since 3.0), name
+    return ptr_size * (5 if version >= 300 else 4)
+
+
+def read(buf, compressed: str | None = None) -> BlendInfo:
+    header_size, version, ptr_size, bhead = _header(buf)
+    is_large = bhead.size == 32
+    name_offset = _name_offset(version, ptr_size)
+    name_len = 258 if version >= 500 else 66
+
+    ids = defaultdict(list)
+    pos = header_size
+    end = len(buf)
+
+    while pos + bhead.size <= end:
+        if is_large:
+            code, _, _, length, _ = bhead.unpack_from(buf, pos)
+        else:
+            code, length, _, _, _ = bhead.unpack_from(buf, pos)
+
+        if code == b"ENDB":
+            break
+
+        pos += bhead.size
+
+        # ID blocks have two letter code padded with zeros
+        if code[2:] == b"\0\0" and (name := ID_CODES.get(code[:2])) is not None:
+            raw = bytes(buf[pos + name_offset:pos + name_offset + name_len])
+            if raw[:2] == code[:2]:
+                ids[name].append(raw[2:raw.find(b"\0")].decode("utf-8", "replace"))
+
+        pos += length
+
+    return BlendInfo(version, compressed, dict(ids))
+
+
+def scan(filepath: str | Path) -> BlendInfo:
+    with open(filepath, "rb") as f:
+        magic = f.read(4)
+        f.seek(0)
+
+        if magic.startswith(_MAGIC_GZIP):
+            return read(gzip.decompress(f.read()), "GZIP")
+        if magic == _MAGIC_ZSTD:
+            return read(_decompress_zstd(f.read()), "ZSTD")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return read(buf)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="List ID blocks of .blend files as JSON Lines")
+    parser.add_argument("files", type=Path, nargs="+")
+    parser.add_argument("--names", action="store_true", help="Include datablock names, counts only otherwise")
+    args = parser.parse_args()
+
+    for filepath in args.files:
+        try:
+            info = scan(filepath)
+        except Exception as e:
+            print(json.dumps({"file": str(filepath), "error": str(e)}))
+            continue
+
+        record = {"file": str(filepath), "version": info.version, "compressed": info.compressed, "counts": info.counts()}
+        if args.names:
+            record["ids"] = info.ids
+        print(json.dumps(record))
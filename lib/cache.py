@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import json
+import sqlite3
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import bpy
+
+
+ADDON_VERSION = tomllib.loads(
+    (Path(__file__).parent.parent / "blender_manifest.toml").read_text(encoding="utf-8")
+)["version"]
+
+_addon_id = __package__.rpartition(".")[0]
+_CHUNK = 1 << 20
+
+
+def default_path() -> Path:
+    try:
+        return Path(bpy.utils.extension_path_user(_addon_id, create=True)) / "batch_cache.sqlite"
+    except ValueError:
+        return Path.home() / ".messythings_cache.sqlite"
+
+
+def file_hash(filepath: Path) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(filepath, "rb") as f:
+        while chunk := f.read(_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Cache:
+    """Last successful batch result per file content, add-on version and operator options"""
+
+    __slots__ = "db", "options", "hits", "misses"
+
+    def __init__(self, path: Path, ops: dict[str, dict]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "hash TEXT, version TEXT, options TEXT, file TEXT, record TEXT, created REAL, "
+            "PRIMARY KEY (hash, version, options))"
+        )
+        self.options = json.dumps(ops, sort_keys=True)
+        self.hits = 0
+        self.misses = 0
+
+    def split(
+        self,
+        files: list[Path],
+        jobs: int = 8,
+        save_paths: dict[Path, Path] | None = None,
+    ) -> tuple[dict[str, str], list[dict]]:
+        """Hash files in parallel, hashlib releases GIL,
+        when saved to separate output, file is only skipped if its output file exists
+
+        :return: Content hashes of files to process by file path, cached records of unchanged files
+        """
+        misses = {}
+        hits = []
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for filepath, digest in zip(files, executor.map(file_hash, files)):
+                row = self.db.execute(
+                    "SELECT record FROM results WHERE hash = ? AND version = ? AND options = ?",
+                    (digest, ADDON_VERSION, self.options),
+                ).fetchone()
+
+                if row is None or (save_paths is not None and not save_paths[filepath].exists()):
+                    misses[str(filepath)] = digest
+                else:
+                    record = json.loads(row[0])
+                    record["file"] = str(filepath)
+                    record["cached"] = True
+                    hits.append(record)
+
+        self.hits += len(hits)
+        self.misses += len(misses)
+
+        return misses, hits
+
+    def store(self, digest: str, record: dict, save_path: Path | None = None) -> None:
+        """Store successful record, also under hash of saved file,
+        so overwritten files are not processed again on next run"""
+        if not record["ok"]:
+            return
+
+        digests = {digest}
+        if save_path is not None and save_path.exists():
+            digests.add(file_hash(save_path))
+
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                [(d, ADDON_VERSION, self.options, record["file"], json.dumps(record), time.time()) for d in digests],
+            )
+
+    def close(self) -> None:
+        self.db.close()
+
+
+# Invalidation
+# ---------------------------
+
+
+def clear(path: Path, files: list[Path] | None = None) -> int:
+    """Remove all entries or entries of given files, by path or current content
+
+    :return: Number of removed entries
+    """
+    if not path.exists():
+        return 0
+
+    db = sqlite3.connect(path)
+
+    with db:
+        if files is None:
+            count = db.execute("DELETE FROM results").rowcount
+        else:
+            count = 0
+            for filepath in files:
+                count += db.execute("DELETE FROM results WHERE file = ?", (str(filepath.resolve()),)).rowcount
+                if filepath.is_file():
+                    count += db.execute("DELETE FROM results WHERE hash = ?", (file_hash(filepath),)).rowcount
+
+    db.execute("VACUUM")
+    db.close()
+
+    return count
+
+
+def stats(path: Path) -> dict[str, int]:
+    if not path.exists():
+        return {"entries": 0, "files": 0}
+
+    db = sqlite3.connect(path)
+    entries, files = db.execute("SELECT COUNT(*), COUNT(DISTINCT file) FROM results").fetchone()
+    db.close()
+
+    return {"entries": entries, "files": files}
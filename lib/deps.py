@@ -0,0 +1,204 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import ID, Collection, Modifier, NodeTree, Object
+
+
+# Pointer property table
+# ---------------------------
+
+
+_pointer_types = {"Object", "Collection"}
+
+# Struct name: (pointer props, (collection prop, pointer prop) for nested pointers)
+_pointer_props: dict[str, tuple[tuple[str, ...], tuple[tuple[str, str], ...]]] = {}
+_pointer_props_none = ((), ())
+
+
+def _get_pointers(struct: bpy.types.Struct) -> tuple[tuple[str, ...], tuple[tuple[str, str], ...]]:
+    props = []
+    nested = []
+
+    for prop in struct.properties:
+        if prop.type == "POINTER" and prop.fixed_type.identifier in _pointer_types:
+            props.append(prop.identifier)
+        elif prop.type == "COLLECTION":
+            for sub in prop.fixed_type.properties:
+                if sub.type == "POINTER" and sub.fixed_type.identifier in _pointer_types:
+                    nested.append((prop.identifier, sub.identifier))
+
+    return tuple(props), tuple(nested)
+
+
+def build_pointer_table() -> None:
+    """Collect Object and Collection pointer properties of every modifier and constraint type,
+    called once on register"""
+    _pointer_props.clear()
+    bases = (bpy.types.Modifier, bpy.types.Constraint)
+
+    for name in dir(bpy.types):
+        cls = getattr(bpy.types, name)
+        if isinstance(cls, type) and issubclass(cls, bases) and cls not in bases:
+            if (pointers := _get_pointers(cls.bl_rna)) != _pointer_props_none:
+                _pointer_props[cls.__name__] = pointers
+
+
+def _ids_from_pointers(item: Modifier | bpy.types.Constraint) -> Iterator[ID]:
+    props, nested = _pointer_props.get(type(item).__name__, _pointer_props_none)
+
+    for prop in props:
+        if (id := getattr(item, prop)) is not None:
+            yield id
+
+    for coll_prop, prop in nested:
+        for sub in getattr(item, coll_prop):
+            if (id := getattr(sub, prop)) is not None:
+                yield id
+
+
+# Node groups
+# ---------------------------
+
+
+_socket_types = {"NodeSocketObject", "NodeSocketCollection"}
+
+# Node group: (Object/Collection input identifiers, IDs referenced inside group and nested groups)
+_ng_cache: dict[NodeTree, tuple[tuple[str, ...], frozenset[ID]]] = {}
+
+
+def _ng_scan(ng: NodeTree) -> tuple[tuple[str, ...], frozenset[ID]]:
+    if (cached := _ng_cache.get(ng)) is not None:
+        return cached
+
+    sockets = tuple(
+        item.identifier
+        for item in ng.interface.items_tree
+        if item.item_type == "SOCKET" and item.in_out == "INPUT" and item.socket_type in _socket_types
+    )
+    ids = set()
+
+    for node in ng.nodes:
+        if node.type == "GROUP" and node.node_tree is not None:
+            ids.update(_ng_scan(node.node_tree)[1])
+
+        for socket in node.inputs:
+            if socket.type in {"OBJECT", "COLLECTION"} and not socket.is_linked and socket.default_value is not None:
+                ids.add(socket.default_value)
+
+    cached = _ng_cache[ng] = sockets, frozenset(ids)
+    return cached
+
+
+@persistent
+def _ng_cache_clear(*args) -> None:
+    _ng_cache.clear()
+
+
+@persistent
+def _ng_cache_update(scene, depsgraph) -> None:
+    if _ng_cache and depsgraph.id_type_updated("NODETREE"):
+        _ng_cache.clear()
+
+
+# Dependencies
+# ---------------------------
+
+
+def ids_from_mod(mod: Modifier) -> Iterator[Object | Collection]:
+    if mod.type == "NODES" and mod.node_group:
+        sockets, ids = _ng_scan(mod.node_group)
+
+        for identifier in sockets:
+            if (id := mod[identifier]) is not None:
+                yield id
+
+        yield from ids
+
+    yield from _ids_from_pointers(mod)
+
+
+def ob_deps(ob: Object) -> Iterator[Object | Collection]:
+    if ob.modifiers:
+        for mod in ob.modifiers:
+            yield from ids_from_mod(mod)
+
+    if ob.constraints:
+        for con in ob.constraints:
+            yield from _ids_from_pointers(con)
+
+    if ob.type == "CURVE":
+        if ob.data.bevel_object:
+            yield ob.data.bevel_object
+        if ob.data.taper_object:
+            yield ob.data.taper_object
+
+
+class DepsIndex:
+    """Object dependency graph in both directions,
+    object -> objects it depends on, object -> objects using it"""
+
+    __slots__ = "deps", "users", "_coll_obs"
+
+    def __init__(self, obs: Iterable[Object] = ()) -> None:
+        self.deps: dict[Object, set[Object]] = {}
+        self.users: defaultdict[Object, set[Object]] = defaultdict(set)
+        self._coll_obs: dict[Collection, tuple[Object]] = {}
+
+        for ob in obs:
+            self.add(ob)
+
+    def add(self, ob: Object) -> None:
+        deps = set()
+
+        for id in ob_deps(ob):
+            if isinstance(id, Collection):
+                if (obs := self._coll_obs.get(id)) is None:
+                    obs = self._coll_obs[id] = tuple(id.all_objects)
+                deps.update(obs)
+            else:
+                deps.add(id)
+
+        deps.discard(ob)
+
+        if deps:
+            self.deps[ob] = deps
+            for dep in deps:
+                self.users[dep].add(ob)
+
+    def is_used(self, ob: Object) -> bool:
+        return ob in self.users
+
+    def closure(self, obs: Iterable[Object], use_users: bool = False) -> set[Object]:
+        """Transitive dependencies or users of given objects"""
+        graph = self.users if use_users else self.deps
+        visited = set()
+        stack = list(obs)
+
+        while stack:
+            for ob in graph.get(stack.pop(), ()):
+                if ob not in visited:
+                    visited.add(ob)
+                    stack.append(ob)
+
+        return visited
+
+
+def register() -> None:
+    build_pointer_table()
+
+    bpy.app.handlers.depsgraph_update_post.append(_ng_cache_update)
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handler.append(_ng_cache_clear)
+
+
+def unregister() -> None:
+    _ng_cache.clear()
+
+    bpy.app.handlers.depsgraph_update_post.remove(_ng_cache_update)
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handler.remove(_ng_cache_clear)
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import NamedTuple
+
+from bpy.types import Modifier, Object
+
+
+class Counts(NamedTuple):
+    verts: int
+    edges: int
+    faces: int
+
+
+# Viewport-only property controlling evaluated resolution per modifier type
+VIEWPORT_PROP = {
+    "SUBSURF": "levels",
+    "MULTIRES": "levels",
+    "SCREW": "steps",
+}
+_SCREW_STEPS_MIN = 4
+
+
+def base_counts(ob: Object) -> Counts:
+    if ob.type != "MESH":
+        return Counts(0, 0, 0)
+    me = ob.data
+    return Counts(len(me.vertices), len(me.edges), len(me.polygons))
+
+
+def _subdivide(c: Counts, levels: int) -> Counts:
+    # Catmull-Clark with quad-dominant topology
+    for _ in range(levels):
+        c = Counts(c.verts + c.edges + c.faces, 2 * c.edges + 4 * c.faces, 4 * c.faces)
+    return c
+
+
+def mod_counts(mod: Modifier, c: Counts, value: int | None = None) -> Counts:
+    """Estimate counts after modifier, value overrides viewport property"""
+    if value is None and (prop := VIEWPORT_PROP.get(mod.type)):
+        value = getattr(mod, prop)
+
+    if mod.type in {"SUBSURF", "MULTIRES"}:
+        return _subdivide(c, value)
+
+    if mod.type == "SCREW":
+        n = value * mod.iterations
+        return Counts(c.verts * (n + 1), c.edges * (n + 1) + c.verts * n, c.faces * 2 + c.edges * n)
+
+    if mod.type == "ARRAY" and mod.fit_type == "FIXED_COUNT":
+        return Counts(*(x * mod.count for x in c))
+
+    if mod.type == "MIRROR":
+        n = 2 ** sum(mod.use_axis)
+        return Counts(*(x * n for x in c))
+
+    return c
+
+
+def ob_counts(ob: Object, values: dict[str, int] | None = None) -> Counts:
+    """Estimate evaluated viewport counts from base mesh and modifier stack,
+    values override viewport property by modifier name"""
+    c = base_counts(ob)
+    values = values or {}
+
+    for mod in ob.modifiers:
+        if mod.show_viewport:
+            c = mod_counts(mod, c, values.get(mod.name))
+
+    return c
+
+
+def lower(mod: Modifier, value: int) -> int | None:
+    """:return: Next lower viewport value or None if already at minimum"""
+    if mod.type == "SCREW":
+        return max(_SCREW_STEPS_MIN, value // 2) if value > _SCREW_STEPS_MIN else None
+    return value - 1 if value > 0 else None
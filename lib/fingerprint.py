@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+from collections.abc import Iterable
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import ID, Material, Node, NodeTree
+
+
+# Canonical structural fingerprint per datablock, node groups are referenced by fingerprint
+# so nested copies (Group, Group.001) compare equal
+_cache: dict[ID, str] = {}
+
+_node_skip = {prop.identifier for prop in Node.bl_rna.properties} | {"is_active_output"}
+_mat_skip = {prop.identifier for prop in ID.bl_rna.properties} | {"node_tree", "preview", "paint_active_slot"}
+_item_skip = {"parent", "index", "position"}
+
+# Nesting depth of hashed settings structs, such as Material.cycles or ImageUser of image nodes
+_DEPTH = 3
+
+
+def _value(value, depth: int = 0) -> object:
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, str | int | bool) or value is None:
+        return value
+    if isinstance(value, NodeTree):
+        return "NT:" + get(value)
+    if isinstance(value, ID):
+        return f"{value.id_type}:{value.name}"
+    if isinstance(value, bpy.types.ColorRamp):
+        return value.color_mode, value.interpolation, tuple(
+            (_value(el.position), _value(el.color)) for el in value.elements
+        )
+    if isinstance(value, bpy.types.CurveMapping):
+        return tuple(tuple((_value(p.location), p.handle_type) for p in curve.points) for curve in value.curves)
+    if isinstance(value, bpy.types.bpy_struct):
+        return _rna_values(value, depth=depth + 1) if depth < _DEPTH else None
+    try:
+        return tuple(_value(x) for x in value)
+    except TypeError:
+        return None
+
+
+def _rna_values(struct, skip: set[str] = frozenset(), depth: int = 0) -> tuple:
+    values = []
+
+    for prop in struct.bl_rna.properties:
+        if prop.identifier in skip or prop.identifier == "rna_type" or prop.type == "COLLECTION":
+            continue
+        values.append((prop.identifier, _value(getattr(struct, prop.identifier), depth)))
+
+    return tuple(values)
+
+
+def _node_sig(node: Node) -> tuple:
+    # Value and RGB nodes store data in output default value
+    sockets = tuple(
+        (sock.is_output, sock.identifier, _value(getattr(sock, "default_value", None)))
+        for sock in (*node.inputs, *node.outputs)
+        if not sock.is_linked and sock.enabled
+    )
+    return node.bl_idname, node.mute, _rna_values(node, _node_skip), sockets
+
+
+def _tree(nt: NodeTree) -> tuple:
+    # Canonical node order by signature, name only breaks ties between identical nodes
+    sigs = {node: repr(_node_sig(node)) for node in nt.nodes if node.type != "FRAME"}
+    order = sorted(sigs, key=lambda node: (sigs[node], node.name))
+    index = {node: i for i, node in enumerate(order)}
+
+    links = sorted(
+        (index[link.from_node], link.from_socket.identifier, index[link.to_node], link.to_socket.identifier)
+        for link in nt.links
+        if link.is_valid and not link.is_muted and link.from_node in index and link.to_node in index
+    )
+    # Identifiers key modifier inputs, defaults and ranges are used by unconnected group inputs
+    interface = tuple(_rna_values(item, _item_skip) for item in nt.interface.items_tree)
+
+    return nt.bl_idname, interface, tuple(sigs[node] for node in order), tuple(links)
+
+
+def get(id: Material | NodeTree) -> str:
+    if (fp := _cache.get(id)) is not None:
+        return fp
+
+    if isinstance(id, NodeTree):
+        data = _tree(id)
+    else:
+        data = _rna_values(id, _mat_skip)
+        if id.use_nodes and id.node_tree is not None:
+            data += (_tree(id.node_tree),)
+
+    fp = _cache[id] = hashlib.blake2b(repr(data).encode(), digest_size=16).hexdigest()
+    return fp
+
+
+def groups(ids: Iterable[Material | NodeTree]) -> list[list[ID]]:
+    """:return: Groups of two or more structurally identical datablocks"""
+    fps = {}
+
+    for id in ids:
+        fps.setdefault((type(id).__name__, get(id)), []).append(id)
+
+    return [ids for ids in fps.values() if len(ids) > 1]
+
+
+def clear() -> None:
+    _cache.clear()
+
+
+# Handlers
+# ---------------------------
+
+
+@persistent
+def _cache_clear(*args) -> None:
+    _cache.clear()
+
+
+@persistent
+def _cache_update(scene, depsgraph) -> None:
+    if _cache and (depsgraph.id_type_updated("NODETREE") or depsgraph.id_type_updated("MATERIAL")):
+        _cache.clear()
+
+
+def register() -> None:
+    bpy.app.handlers.depsgraph_update_post.append(_cache_update)
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handler.append(_cache_clear)
+
+
+def unregister() -> None:
+    _cache.clear()
+
+    bpy.app.handlers.depsgraph_update_post.remove(_cache_update)
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handler.remove(_cache_clear)
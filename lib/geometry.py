@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bmesh
+import numpy as np
+from bpy.types import Mesh
+
+
+def _get(coll, prop: str, size: int, dtype) -> np.ndarray:
+    arr = np.empty(len(coll) * size, dtype=dtype)
+    coll.foreach_get(prop, arr)
+    return arr
+
+
+def problems(me: Mesh, dist: float) -> dict[str, int]:
+    """Count loose vertices, zero area faces and coincident vertices from bulk buffers,
+    coincident vertices are detected on grid with cell diagonal of merge distance,
+    vertices sharing cell are always within merge distance, pairs across cell border are missed
+
+    :return: Problem counts, empty if mesh is clean
+    """
+    count = len(me.vertices)
+
+    # Meshes without edges are point clouds made on purpose
+    if not count or not me.edges:
+        return {}
+
+    found = {}
+
+    # Vertices not used by any edge, face vertices are always used by edges
+    used = np.zeros(count, dtype=bool)
+    used[_get(me.edges, "vertices", 2, np.int32)] = True
+    if (loose := count - int(np.count_nonzero(used))):
+        found["loose"] = loose
+
+    if me.polygons:
+        areas = _get(me.polygons, "area", 1, np.float32)
+        if (degenerate := int(np.count_nonzero(areas <= dist * dist))):
+            found["degenerate"] = degenerate
+
+    co = _get(me.vertices, "co", 3, np.float32).reshape(-1, 3).astype(np.float64)
+    cells = np.floor(co * (np.sqrt(3.0) / dist)).astype(np.int64)
+    if (coincident := count - len(np.unique(cells, axis=0))):
+        found["coincident"] = coincident
+
+    return found
+
+
+def fix(me: Mesh, found: dict[str, int], dist: float) -> tuple[int, int]:
+    """Clean up mesh with bmesh, only operations for found problems are run
+
+    :return: Number of removed vertices and faces
+    """
+    bm = bmesh.new()
+    bm.from_mesh(me)
+    verts = len(bm.verts)
+    faces = len(bm.faces)
+
+    if "coincident" in found:
+        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=dist)
+    if "degenerate" in found:
+        bmesh.ops.dissolve_degenerate(bm, dist=dist, edges=bm.edges[:])
+    if "loose" in found:
+        bmesh.ops.delete(bm, geom=[v for v in bm.verts if not v.link_edges], context="VERTS")
+
+    verts -= len(bm.verts)
+    faces -= len(bm.faces)
+
+    bm.to_mesh(me)
+    bm.free()
+    me.update()
+
+    return verts, faces
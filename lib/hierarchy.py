@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+import bpy
+from bpy.types import Collection, Object, Scene
+
+
+class CollectionIndex:
+    """Collection hierarchy of the file including scene collections,
+    direct object counts can be adjusted to predict emptiness after relinking"""
+
+    __slots__ = "children", "parents", "counts", "roots", "_scenes"
+
+    def __init__(self) -> None:
+        self.children: dict[Collection, tuple[Collection]] = {}
+        self.parents: defaultdict[Collection, list[Collection]] = defaultdict(list)
+        self.counts: dict[Collection, int] = {}
+        self.roots = {scene.collection for scene in bpy.data.scenes}
+        self._scenes: dict[Collection, frozenset[Scene]] = {
+            scene.collection: frozenset((scene,)) for scene in bpy.data.scenes
+        }
+
+        for coll in (*bpy.data.collections, *self.roots):
+            self.add(coll)
+
+    def add(self, coll: Collection) -> None:
+        self.children[coll] = children = tuple(coll.children)
+        self.counts[coll] = len(coll.objects)
+
+        for child in children:
+            self.parents[child].append(coll)
+
+    def all_objects(self, coll: Collection) -> list[Object]:
+        obs = {}
+        stack = [coll]
+        visited = set()
+
+        while stack:
+            if (coll := stack.pop()) not in visited:
+                visited.add(coll)
+                obs.update(dict.fromkeys(coll.objects))
+                stack += self.children[coll]
+
+        return list(obs)
+
+    def scenes(self, coll: Collection) -> frozenset[Scene]:
+        """Scenes which contain collection, memoized per collection"""
+        if (scenes := self._scenes.get(coll)) is None:
+            scenes = self._scenes[coll] = frozenset().union(*(self.scenes(parent) for parent in self.parents[coll]))
+        return scenes
+
+    def scene_membership(self, obs: Iterable[Object]) -> dict[Object, frozenset[Scene]]:
+        """Scenes of each object in single pass over objects, objects not in any scene are left out"""
+        membership = {}
+
+        for ob in obs:
+            if (scenes := frozenset().union(*(self.scenes(coll) for coll in ob.users_collection))):
+                membership[ob] = scenes
+
+        return membership
+
+    def empty_collections(self, keep: set[Collection] = frozenset()) -> list[Collection]:
+        """Collections without objects in their subtree, computed bottom-up,
+        scene collections and collections in keep are never empty"""
+        keep = keep | self.roots
+        pending = {coll: len(children) for coll, children in self.children.items()}
+        filled_children = dict.fromkeys(self.children, 0)
+        queue = [coll for coll, count in pending.items() if not count]
+        empty = []
+
+        while queue:
+            coll = queue.pop()
+            is_empty = not self.counts[coll] and not filled_children[coll] and coll not in keep
+
+            if is_empty:
+                empty.append(coll)
+
+            for parent in self.parents[coll]:
+                if not is_empty:
+                    filled_children[parent] += 1
+                pending[parent] -= 1
+                if not pending[parent]:
+                    queue.append(parent)
+
+        return empty
@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import os
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from bpy.types import Mesh
+
+
+BATCH_SIZE = 256
+
+# Attribute data type: (foreach property, components, dtype)
+_attr_types = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+}
+
+
+def _get(coll, prop: str, size: int, dtype) -> np.ndarray:
+    arr = np.empty(len(coll) * size, dtype=dtype)
+    coll.foreach_get(prop, arr)
+    return arr
+
+
+def read(me: Mesh, use_attributes: bool = True) -> list[tuple[str, np.ndarray]] | None:
+    """Read geometry buffers, must run in main thread,
+    None if mesh has data which can not be compared"""
+    if me.shape_keys is not None:
+        return None
+
+    bufs = [
+        ("co", _get(me.vertices, "co", 3, np.float32)),
+        ("edges", _get(me.edges, "vertices", 2, np.int32)),
+        ("loops", _get(me.loops, "vertex_index", 1, np.int32)),
+        ("polys", _get(me.polygons, "loop_total", 1, np.int32)),
+    ]
+
+    # Custom split normals are not exposed as attribute, they change shading
+    if me.has_custom_normals:
+        bufs.append(("normals", _get(me.corner_normals, "vector", 3, np.float32)))
+
+    if use_attributes:
+        for attr in me.attributes:
+            if attr.name.startswith(".") or attr.name == "position":
+                continue
+            if (spec := _attr_types.get(attr.data_type)) is None:
+                return None
+            prop, size, dtype = spec
+            bufs.append((f"{attr.name}:{attr.domain}:{attr.data_type}", _get(attr.data, prop, size, dtype)))
+
+    return bufs
+
+
+def digest(bufs: list[tuple[str, np.ndarray]], tolerance: float) -> bytes:
+    """Hash geometry buffers, coordinates and float attributes quantized to tolerance,
+    thread safe, NumPy and hashlib release GIL on large buffers"""
+    h = hashlib.blake2b(digest_size=20)
+
+    for name, arr in bufs:
+        if arr.dtype == np.float32:
+            arr = np.round(arr / tolerance).astype(np.int64)
+        h.update(name.encode())
+        h.update(len(arr).to_bytes(8, "little"))
+        h.update(arr.tobytes())
+
+    return h.digest()
+
+
+def _batches(meshes: list[Mesh]) -> Iterator[list[Mesh]]:
+    for i in range(0, len(meshes), BATCH_SIZE):
+        yield meshes[i:i + BATCH_SIZE]
+
+
+def group(meshes: list[Mesh], tolerance: float = 1e-5, use_attributes: bool = True) -> list[list[Mesh]]:
+    """Group meshes with identical geometry, materials and attributes,
+    buffers are read in batches in main thread while previous batch is hashed in thread pool
+
+    :return: Groups of two or more identical meshes
+    """
+    groups = defaultdict(list)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        pending = []
+
+        for batch in _batches(meshes):
+            jobs = []
+
+            for me in batch:
+                if (bufs := read(me, use_attributes)) is not None:
+                    key = tuple(mat.name if mat else None for mat in me.materials)
+                    jobs.append((me, key, executor.submit(digest, bufs, tolerance)))
+
+            for me, key, future in pending:
+                groups[key, future.result()].append(me)
+
+            pending = jobs
+
+        for me, key, future in pending:
+            groups[key, future.result()].append(me)
+
+    return [meshes for meshes in groups.values() if len(meshes) > 1]
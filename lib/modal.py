@@ -0,0 +1,32 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections.abc import Callable, Generator
+
+
+# Heavy loops are written as generators yielding (label, done, total) progress
+# every CHUNK items, each item is fully processed before yielding,
+# so closing generator on cancel leaves consistent state
+CHUNK = 256
+
+# Seconds of work per timer event in modal execution
+TIME_SLICE = 0.05
+
+Steps = Generator[tuple[str, int, int], None, object]
+
+
+def call(func: Callable, *args) -> Steps:
+    """Yield from func if it is a generator, otherwise return its result"""
+    result = func(*args)
+    if isinstance(result, Generator):
+        return (yield from result)
+    return result
+
+
+def drain(steps: Steps) -> object:
+    """Run steps to completion, return result"""
+    try:
+        while True:
+            next(steps)
+    except StopIteration as e:
+        return e.value
@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from bpy.types import ID, Image
+
+
+# Purgeable ID types and their bpy.data collections
+DATA = {
+    "OBJECT": "objects",
+    "MESH": "meshes",
+    "CURVE": "curves",
+    "LATTICE": "lattices",
+    "MATERIAL": "materials",
+    "NODETREE": "node_groups",
+    "IMAGE": "images",
+    "TEXTURE": "textures",
+    "ACTION": "actions",
+    "LIGHT": "lights",
+    "CAMERA": "cameras",
+    "GREASEPENCIL": "grease_pencils",
+}
+
+# Datablocks which keep file content alive
+_root_types = {"SCENE", "WINDOWMANAGER", "WORKSPACE", "SCREEN"}
+
+
+def unreachable(user_map: dict[ID, set[ID]], removed: Iterable[ID] = ()) -> set[ID]:
+    """Datablocks not reachable from any scene, window manager or fake user,
+    datablocks in removed are treated as already deleted, so whatever only they use becomes unreachable"""
+    removed = set(removed)
+    uses = defaultdict(list)
+
+    for id, users in user_map.items():
+        for user in users:
+            uses[user].append(id)
+
+    stack = [id for id in user_map if (id.id_type in _root_types or id.use_fake_user) and id not in removed]
+    reached = set()
+
+    while stack:
+        if (id := stack.pop()) not in reached:
+            reached.add(id)
+            stack += (x for x in uses[id] if x not in reached and x not in removed)
+
+    return {id for id in user_map if id not in reached}
+
+
+def collect(user_map: dict[ID, set[ID]], types: set[str], removed: Iterable[ID] = ()) -> list[ID]:
+    """:return: Local datablocks of given types which are unreachable"""
+    removed = set(removed)
+    return sorted(
+        (
+            id for id in unreachable(user_map, removed)
+            if id.id_type in types and id.library is None and id not in removed
+        ),
+        key=lambda id: (id.id_type, id.name),
+    )
+
+
+# Memory
+# ---------------------------
+
+
+def image_size(img: Image, load: bool = False) -> int:
+    """Estimated in-memory size of image buffer in bytes,
+    packed size for images not loaded unless load is set, accessing size loads image"""
+    if not (load or img.has_data):
+        return img.packed_file.size if img.packed_file else 0
+    width, height = img.size
+    return width * height * img.channels * (4 if img.is_float else 1)
+
+
+def estimate_size(id: ID) -> int:
+    """Rough in-memory size of datablock in bytes"""
+    match id.id_type:
+        case "MESH":
+            return (
+                len(id.vertices) * 12 + len(id.edges) * 8 + len(id.loops) * 8 + len(id.polygons) * 8
+                + sum(len(attr.data) * 4 for attr in id.attributes)
+            )
+        case "CURVE":
+            return sum(len(spline.bezier_points) * 56 + len(spline.points) * 28 for spline in id.splines)
+        case "IMAGE":
+            return image_size(id)
+        case "ACTION":
+            return sum(len(fcu.keyframe_points) * 40 for fcu in getattr(id, "fcurves", ()))
+        case "LATTICE":
+            return id.points_u * id.points_v * id.points_w * 24
+    return 0
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,272 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import time
+from pathlib import Path
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.props import BoolProperty, EnumProperty, StringProperty
+from bpy.types import ID, Collection
+
+from . import modal, orphans, profiler
+
+
+# Last computed plan per operator
+last: dict[str, dict] = {}
+
+
+# References
+# ---------------------------
+
+
+# Actions hold datablocks, in plan JSON they are replaced with {"id": [id_type, name, library]} references
+_DATA = orphans.DATA | {"COLLECTION": "collections", "SCENE": "scenes"}
+
+
+def _lib(id: ID) -> str | None:
+    return id.library.filepath if id.library else None
+
+
+def dump(value: object) -> object:
+    """Replace datablocks with references, scene collections are referenced by scene"""
+    if isinstance(value, ID):
+        if value.is_embedded_data and isinstance(value, Collection):
+            scene = next(scene for scene in bpy.data.scenes if scene.collection == value)
+            return {"id": ["SCENE_COLLECTION", scene.name, _lib(scene)]}
+        return {"id": [value.id_type, value.name, _lib(value)]}
+    if isinstance(value, list | tuple):
+        return [dump(x) for x in value]
+    if isinstance(value, dict):
+        return {k: dump(x) for k, x in value.items()}
+    return value
+
+
+def resolve(value: object, tables: dict[str, dict] | None = None) -> object:
+    """Replace references with datablocks, None for datablocks which no longer exist,
+    lists of references only keep existing datablocks,
+    names are looked up in one table per datablock type"""
+    if tables is None:
+        tables = {}
+
+    if isinstance(value, dict):
+        if (ref := value.get("id")) is not None and len(value) == 1:
+            id_type, name, lib = ref
+            return _table(id_type, tables).get((name, lib))
+        return {k: resolve(x, tables) for k, x in value.items()}
+
+    if isinstance(value, list):
+        values = [resolve(x, tables) for x in value]
+        if value and all(isinstance(x, dict) and "id" in x for x in value):
+            return [x for x in values if x is not None]
+        return values
+
+    return value
+
+
+def _table(id_type: str, tables: dict[str, dict]) -> dict[tuple[str, str | None], ID]:
+    if (table := tables.get(id_type)) is None:
+        if id_type == "SCENE_COLLECTION":
+            table = {(scene.name, _lib(scene)): scene.collection for scene in bpy.data.scenes}
+        elif (data := _DATA.get(id_type)) is not None:
+            table = {(id.name, _lib(id)): id for id in getattr(bpy.data, data)}
+        else:
+            table = {}
+        tables[id_type] = table
+    return table
+
+
+# IO
+# ---------------------------
+
+
+def save(plan: dict, filepath: str) -> None:
+    Path(filepath).write_text(json.dumps(plan, indent=1), encoding="utf-8")
+
+
+def load(idname: str, filepath: str) -> dict:
+    if not filepath:
+        if (plan := last.get(idname)) is None:
+            raise ValueError("No plan computed in this session, set plan file")
+        return plan
+
+    plan = json.loads(Path(filepath).read_text(encoding="utf-8"))
+
+    if plan.get("operator") != idname:
+        raise ValueError(f"Plan is made for {plan.get('operator')} operator")
+
+    return plan
+
+
+def check_file(plan: dict) -> None:
+    """Names in plan only resolve to same datablocks in file plan is made for"""
+    if plan.get("file") != bpy.data.filepath:
+        raise ValueError(f"Plan is made for {plan.get('file') or 'unsaved'} file")
+
+
+# Operator
+# ---------------------------
+
+
+class PlanMixin:
+    """Split operator into read-only plan and apply stages,
+    operators implement plan(context) -> dict | None and apply(context, actions) -> set[str],
+    either can be a generator yielding progress to run modal in time slices, see modal module,
+    actions hold datablocks, they are turned into references only when written to plan"""
+
+    plan_mode: EnumProperty(
+        name="Mode",
+        items=(
+            ("EXECUTE", "Execute", "Scan and apply changes"),
+            ("PLAN", "Plan", "Write changes that would be made to JSON file, without changing anything"),
+            ("APPLY", "Apply Plan", "Apply changes from JSON file without scanning the scene"),
+        ),
+        options={"SKIP_SAVE"},
+    )
+    plan_path: StringProperty(
+        name="Plan File",
+        description="JSON file to save plan to or apply plan from, last plan is kept in memory when not set",
+        subtype="FILE_PATH",
+        options={"SKIP_SAVE"},
+    )
+    # Action keys with information only, not counted as changes
+    plan_info = frozenset()
+
+    use_modal: BoolProperty(
+        description="Run in time slices with progress and Esc to cancel, set when invoked from UI",
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+
+    def draw_plan(self, layout: bpy.types.UILayout) -> None:
+        layout.separator()
+        layout.prop(self, "plan_mode")
+        if self.plan_mode != "EXECUTE":
+            layout.prop(self, "plan_path")
+
+    def plan_options(self) -> dict:
+        options = {}
+
+        for prop in self.bl_rna.properties:
+            if prop.identifier not in {"rna_type", "plan_mode", "plan_path", "use_modal"}:
+                value = getattr(self, prop.identifier)
+                options[prop.identifier] = sorted(value) if isinstance(value, set) else value
+
+        return options
+
+    def execute(self, context):
+        profiler.start(self.bl_idname)
+        self._applying = False
+        steps = self._steps(context)
+
+        # Background mode and redo have no event loop to run in
+        if self.use_modal and not bpy.app.background and context.window is not None and not self.is_repeat():
+            wm = context.window_manager
+            self._modal_steps = steps
+            self._timer = wm.event_timer_add(0.001, window=context.window)
+            wm.progress_begin(0, 1000)
+            wm.modal_handler_add(self)
+            return {"RUNNING_MODAL"}
+
+        try:
+            ret = modal.drain(steps)
+        finally:
+            summary = profiler.finish()
+
+        if summary is not None:
+            self.report({"INFO"}, f"Profile: {summary}")
+
+        return ret
+
+    def modal(self, context, event):
+        # Swallow all other events, scene must not change between time slices
+        if event.type == "ESC":
+            self._modal_steps.close()
+            self.report({"WARNING"}, "Cancelled, changes made so far are kept" if self._applying else "Cancelled")
+            return self._modal_end(context, {"FINISHED"} if self._applying else {"CANCELLED"})
+
+        if event.type != "TIMER":
+            return {"RUNNING_MODAL"}
+
+        time_end = time.perf_counter() + modal.TIME_SLICE
+
+        try:
+            while time.perf_counter() < time_end:
+                label, done, total = next(self._modal_steps)
+        except StopIteration as e:
+            return self._modal_end(context, e.value)
+        except Exception:
+            self._modal_end(context, {"CANCELLED"})
+            raise
+
+        context.workspace.status_text_set(f"{self.bl_label}: {label} {done:,} / {total:,}, Esc to cancel")
+        context.window_manager.progress_update(int(done / total * 1000) if total else 0)
+
+        return {"RUNNING_MODAL"}
+
+    def _modal_end(self, context, ret: set[str]) -> set[str]:
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+        if (summary := profiler.finish()) is not None:
+            self.report({"INFO"}, f"Profile: {summary}")
+
+        return ret
+
+    def _steps(self, context) -> modal.Steps:
+        filepath = bpy.path.abspath(self.plan_path) if self.plan_path else ""
+
+        if self.plan_mode == "APPLY":
+            try:
+                plan = load(self.bl_idname, filepath)
+                check_file(plan)
+            except (OSError, ValueError) as e:
+                self.report({"ERROR"}, str(e))
+                return {"CANCELLED"}
+            with profiler.phase("resolve"):
+                actions = resolve(plan["actions"])
+            self._applying = True
+            return (yield from modal.call(self.apply, context, actions))
+
+        if (actions := (yield from modal.call(self.plan, context))) is None:
+            return {"CANCELLED"}
+
+        if self.plan_mode == "EXECUTE":
+            self._applying = True
+            return (yield from modal.call(self.apply, context, actions))
+
+        plan = last[self.bl_idname] = {
+            "operator": self.bl_idname,
+            "file": bpy.data.filepath,
+            "options": self.plan_options(),
+            "actions": dump(actions),
+        }
+
+        if filepath:
+            save(plan, filepath)
+
+        count = sum(len(x) for k, x in actions.items() if isinstance(x, (list, dict)) and k not in self.plan_info)
+        self.report({"INFO"}, f"Plan: {count} changes" + (f", saved to {filepath}" if filepath else ""))
+
+        # Nothing changed, skip undo push
+        return {"CANCELLED"}
+
+
+# Handlers
+# ---------------------------
+
+
+@persistent
+def _last_clear(*args) -> None:
+    last.clear()
+
+
+def register() -> None:
+    bpy.app.handlers.load_post.append(_last_clear)
+
+
+def unregister() -> None:
+    last.clear()
+    bpy.app.handlers.load_post.remove(_last_clear)
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import logging.handlers
+import os
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import bpy
+
+
+# Stats of last profiled run per operator:
+# {"operator", "file", "time", "phases": {name: seconds}, "counts": {name: int}, "writes": int}
+last_run: dict[str, dict] = {}
+
+_addon_id = __package__.rpartition(".")[0]
+_log = logging.getLogger(_addon_id + ".profile")
+_run: dict | None = None
+
+
+def is_enabled() -> bool:
+    if os.environ.get("MESSYTHINGS_PROFILE", "") not in {"", "0"}:
+        return True
+    if (addon := bpy.context.preferences.addons.get(_addon_id)) is not None:
+        return addon.preferences.use_profiling
+    return False
+
+
+def _log_path() -> Path:
+    try:
+        return Path(bpy.utils.extension_path_user(_addon_id, create=True)) / "profile.log"
+    except ValueError:
+        return Path(tempfile.gettempdir()) / "messythings_profile.log"
+
+
+def _logger() -> logging.Logger:
+    if not _log.handlers:
+        handler = logging.handlers.RotatingFileHandler(_log_path(), maxBytes=1 << 20, backupCount=3, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        _log.addHandler(handler)
+        _log.setLevel(logging.INFO)
+        _log.propagate = False
+    return _log
+
+
+# Run
+# ---------------------------
+
+
+def start(idname: str) -> None:
+    global _run
+
+    if not is_enabled():
+        _run = None
+        return
+
+    _run = {
+        "operator": idname,
+        "file": bpy.data.filepath,
+        "time": time.perf_counter(),
+        "phases": defaultdict(float),
+        "counts": defaultdict(int),
+        "writes": 0,
+    }
+
+
+def finish() -> str | None:
+    """Store and log stats of current run, return summary for report"""
+    global _run
+
+    if _run is None:
+        return None
+
+    stats = _run
+    _run = None
+
+    stats["time"] = round(time.perf_counter() - stats["time"], 4)
+    stats["phases"] = {k: round(v, 4) for k, v in stats["phases"].items()}
+    stats["counts"] = dict(stats["counts"])
+    last_run[stats["operator"]] = stats
+
+    phases = ", ".join(f"{k} {v:.3f} s" for k, v in stats["phases"].items())
+    counts = ", ".join(f"{k} {v}" for k, v in stats["counts"].items())
+    summary = f"{stats['time']:.3f} s [{phases}] [{counts}] {stats['writes']} writes"
+
+    _logger().info(f"{stats['operator']} {stats['file'] or '<unsaved>'} {summary}")
+
+    return summary
+
+
+@contextmanager
+def _phase(name: str):
+    time_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _run["phases"][name] += time.perf_counter() - time_start
+
+
+def phase(name: str):
+    """Time code block, no-op when profiling is disabled"""
+    if _run is None:
+        return nullcontext()
+    return _phase(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    if _run is not None:
+        _run["counts"][name] += n
+
+
+def writes(n: int = 1) -> None:
+    """Count RNA writes"""
+    if _run is not None:
+        _run["writes"] += n
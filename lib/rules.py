@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from array import array
+from collections.abc import Sequence
+from itertools import repeat
+from typing import NamedTuple
+
+import bpy
+from bpy.types import Object
+
+
+class Rule(NamedTuple):
+    collection: str
+    ob_types: frozenset[str] = frozenset()
+    display_types: frozenset[str] = frozenset()
+    prop: str = ""
+    use_instancer_children: bool = False
+    use_curve_geometry: bool = False
+
+
+DEFAULT_RULES = (
+    Rule("Gems", prop="gem", use_instancer_children=True),
+    Rule("Main", frozenset({"MESH"}), frozenset({"TEXTURED", "SOLID"})),
+    Rule("Main", frozenset({"CURVE"}), use_curve_geometry=True),
+    Rule("Main", frozenset({"FONT", "META"})),
+    Rule("Gpensil", frozenset({"GPENCIL", "GREASEPENCIL"})),
+    Rule("Lights", frozenset({"LIGHT", "LIGHT_PROBE"})),
+)
+DEFAULT_FALLBACK = "Helpers"
+
+
+def get_rules() -> tuple[tuple[Rule, ...], str]:
+    if (addon := bpy.context.preferences.addons.get(__package__.rpartition(".")[0])) is not None:
+        prefs = addon.preferences
+        if prefs.sort_rules:
+            rules = tuple(
+                Rule(
+                    rule.collection,
+                    frozenset(rule.ob_types),
+                    frozenset(rule.display_types),
+                    rule.prop,
+                    rule.use_instancer_children,
+                    rule.use_curve_geometry,
+                )
+                for rule in prefs.sort_rules
+                if rule.collection
+            )
+            return rules, prefs.sort_fallback or DEFAULT_FALLBACK
+
+    return DEFAULT_RULES, DEFAULT_FALLBACK
+
+
+def _bulk_get(obs: Sequence[Object], prop: str) -> list:
+    if isinstance(obs, bpy.types.bpy_prop_collection):
+        rna_prop = Object.bl_rna.properties[prop]
+
+        if rna_prop.type == "ENUM":
+            values = array("i", bytes(4 * len(obs)))
+            obs.foreach_get(prop, values)
+            ids = {item.value: item.identifier for item in rna_prop.enum_items}
+            return [ids[x] for x in values]
+
+        values = array("b", bytes(len(obs)))
+        obs.foreach_get(prop, values)
+        return [bool(x) for x in values]
+
+    return [getattr(ob, prop) for ob in obs]
+
+
+def classify(obs: Sequence[Object], rules: tuple[Rule, ...], fallback: str) -> dict[Object, str]:
+    """Map objects to target collection names, first matching rule wins"""
+    ob_types = _bulk_get(obs, "type")
+    display_types = _bulk_get(obs, "display_type") if any(rule.display_types for rule in rules) else repeat(None)
+    is_instancer = _bulk_get(obs, "is_instancer") if any(rule.use_instancer_children for rule in rules) else repeat(False)
+
+    # Parents of objects with custom property, single pass over file objects
+
+    parents = {rule.prop: set() for rule in rules if rule.prop and rule.use_instancer_children}
+
+    if parents:
+        for ob in bpy.data.objects:
+            if (parent := ob.parent) is not None:
+                for prop, obs_parent in parents.items():
+                    if prop in ob:
+                        obs_parent.add(parent)
+
+    # Classify
+
+    compiled = tuple(
+        (
+            rule.collection,
+            rule.ob_types,
+            rule.display_types,
+            rule.prop,
+            parents.get(rule.prop) if rule.use_instancer_children else None,
+            rule.use_curve_geometry,
+        )
+        for rule in rules
+    )
+    targets = {}
+
+    for ob, ob_type, display_type, instancer in zip(obs, ob_types, display_types, is_instancer):
+        for name, types, displays, prop, obs_parent, use_curve_geometry in compiled:
+            if types and ob_type not in types:
+                continue
+            if displays and display_type not in displays:
+                continue
+            if prop and prop not in ob and not (obs_parent and instancer and ob in obs_parent):
+                continue
+            if use_curve_geometry and not (ob_type == "CURVE" and (ob.data.bevel_depth or ob.data.bevel_object)):
+                continue
+
+            targets[ob] = name
+            break
+        else:
+            targets[ob] = fallback
+
+    return targets
@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import bpy
+
+from . import batch
+
+
+# File-drop queue layout:
+#   <id>.job          job waiting to be claimed
+#   <id>.<pid>.run    job claimed by worker process
+#   <id>.result       result record
+#   stop              ask workers to exit
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _claim(queue: Path) -> tuple[str, Path] | None:
+    pid = os.getpid()
+
+    for job in sorted(queue.glob("*.job")):
+        running = job.with_suffix(f".{pid}.run")
+        try:
+            job.rename(running)
+        except OSError:
+            continue  # Claimed by another worker
+        return job.stem, running
+
+
+def _print_stats(jobs: int, busy: float, time_start: float) -> None:
+    wall = time.perf_counter() - time_start
+    rate = jobs / wall * 60 if wall else 0.0
+    print(f"Worker {os.getpid()}: {jobs} jobs, {busy:.1f} s busy, {wall:.1f} s total, {rate:.1f} jobs/min", file=sys.stderr)
+
+
+def serve(queue: Path, max_jobs: int = 0, idle_timeout: float = 0.0) -> int:
+    """Process jobs from queue until stopped, idle for too long or max_jobs is reached,
+    add-on stays loaded between jobs"""
+    time_start = time_idle = time.perf_counter()
+    jobs = 0
+    busy = 0.0
+
+    while not (queue / "stop").exists():
+        if (claimed := _claim(queue)) is None:
+            if idle_timeout and time.perf_counter() - time_idle > idle_timeout:
+                break
+            time.sleep(0.05)
+            continue
+
+        job_id, running = claimed
+        job = json.loads(running.read_text(encoding="utf-8"))
+
+        record = batch.process_file(Path(job["file"]), job["ops"], Path(job["save_as"]))
+        record["worker"] = os.getpid()
+        _write_json(queue / f"{job_id}.result", record)
+        running.unlink()
+
+        bpy.ops.wm.read_homefile(use_empty=True, use_factory_startup=True)
+
+        jobs += 1
+        busy += record["time"]
+        time_idle = time.perf_counter()
+        _print_stats(jobs, busy, time_start)
+
+        if max_jobs and jobs >= max_jobs:
+            break
+
+    return 0
+
+
+# Driver
+# ---------------------------
+
+
+def _spawn(queue: Path, max_jobs: int) -> subprocess.Popen:
+    cmd = (
+        bpy.app.binary_path,
+        "--background",
+        "--command", "messythings", "worker", str(queue),
+        "--max-jobs", str(max_jobs),
+        "--idle-timeout", "2",
+    )
+    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+
+
+def run_pool(
+    files: list[Path],
+    ops: dict[str, dict],
+    root: Path,
+    output: Path | None = None,
+    jobs: int = 4,
+    timeout: float = 300.0,
+    max_jobs: int = 50,
+) -> Iterator[dict]:
+    """Same as batch.run_batch but with warm workers processing many files each,
+    workers are recycled after max_jobs"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = Path(tmp)
+        pending = {}
+
+        for i, filepath in enumerate(files):
+            job_id = f"{i:06d}"
+            save_path = filepath if output is None else output / filepath.relative_to(root)
+            _write_json(queue / f"{job_id}.job", {"file": str(filepath), "ops": ops, "save_as": str(save_path)})
+            pending[job_id] = str(filepath)
+
+        procs = {}
+        workers = set()
+        claimed = set()
+        started = {}
+        failed_starts = 0
+
+        while pending:
+
+            # Results
+
+            for path in queue.glob("*.result"):
+                record = json.loads(path.read_text(encoding="utf-8"))
+                path.unlink()
+                started.pop(path.stem, None)
+                claimed.add(record.get("worker"))
+                if pending.pop(path.stem, None) is not None:
+                    yield record
+
+            # Running jobs
+
+            now = time.perf_counter()
+
+            for path in queue.glob("*.run"):
+                job_id, pid = path.stem.split(".")
+                pid = int(pid)
+                claimed.add(pid)
+
+                if job_id not in pending or (proc := procs.get(pid)) is None:
+                    continue
+
+                time_start = started.setdefault(job_id, now)
+
+                if now - time_start > timeout:
+                    proc.kill()
+                    proc.wait()
+                    error = f"Timed out after {timeout} s"
+                elif proc.poll() is not None and not (queue / f"{job_id}.result").exists():
+                    error = f"Worker crashed, exit code {proc.returncode}"
+                else:
+                    continue
+
+                path.unlink(missing_ok=True)
+                del started[job_id]
+                yield {"file": pending.pop(job_id), "ok": False, "error": error, "time": round(now - time_start, 3)}
+
+            # Recycle workers
+
+            for pid in tuple(workers):
+                if (proc := procs[pid]).poll() is not None:
+                    workers.remove(pid)
+                    if proc.returncode and pid not in claimed:
+                        failed_starts += 1
+
+            if failed_starts > jobs * 2:
+                for filepath in pending.values():
+                    yield {"file": filepath, "ok": False, "error": "Workers failed to start", "time": 0.0}
+                break
+
+            waiting = sum(1 for _ in queue.glob("*.job"))
+
+            while len(workers) < jobs and waiting:
+                proc = _spawn(queue, max_jobs)
+                procs[proc.pid] = proc
+                workers.add(proc.pid)
+                waiting -= 1
+
+            time.sleep(0.05)
+
+        (queue / "stop").touch()
+        for pid in workers:
+            procs[pid].wait()
@@ -1,3 +1,6 @@
+from .analyze import *
 from .cleanup import *
+from .dedupe import *
+from .images import *
 from .sort import *
 from .tweak import *
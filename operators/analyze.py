@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import time
+from pathlib import Path
+
+import bpy
+from bpy.props import BoolProperty, EnumProperty, IntProperty, StringProperty
+from bpy.types import Object, Operator
+
+from ..lib import profiler
+
+
+# Result of last analysis: {"objects": [...], "collections": [...], "total": {...}}
+last: dict[str, list | dict] = {}
+
+_geometry_types = {"MESH", "CURVE", "SURFACE", "FONT", "META"}
+
+
+def _counts(ob_eval: Object) -> tuple[int, int]:
+    """Vertex and triangle count of evaluated object, other than mesh types are streamed through to_mesh"""
+    if ob_eval.type == "MESH":
+        me = ob_eval.data
+        return len(me.vertices), len(me.loops) - 2 * len(me.polygons)
+
+    try:
+        me = ob_eval.to_mesh()
+    except RuntimeError:
+        return 0, 0
+
+    count = (0, 0) if me is None else (len(me.vertices), len(me.loops) - 2 * len(me.polygons))
+    ob_eval.to_mesh_clear()
+
+    return count
+
+
+class SCENE_OT_messythings_analyze(Operator):
+    bl_label = "Analyze Evaluated Geometry"
+    bl_description = (
+        "Report evaluated vertex and triangle counts per object and collection, "
+        "and time to re-evaluate each object, select heaviest objects"
+    )
+    bl_idname = "scene.messythings_analyze"
+    bl_options = {"REGISTER", "UNDO"}
+
+    sort_by: EnumProperty(
+        name="Sort By",
+        items=(
+            ("TRIS", "Triangles", ""),
+            ("VERTS", "Vertices", ""),
+            ("TIME", "Evaluation Time", ""),
+        ),
+    )
+    use_eval_time: BoolProperty(
+        name="Evaluation Time",
+        description="Measure modifier evaluation cost by re-evaluating objects one at a time, slow for large scenes",
+    )
+    select_count: IntProperty(
+        name="Select Top",
+        description="Select this many heaviest objects, 0 to keep selection",
+        default=10,
+        min=0,
+    )
+    report_count: IntProperty(
+        name="Report Top",
+        description="Number of heaviest objects and collections listed in report",
+        default=20,
+        min=1,
+    )
+    report_path: StringProperty(
+        name="Report File",
+        description="Write full result to JSON file",
+        subtype="FILE_PATH",
+        options={"SKIP_SAVE"},
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "use_eval_time")
+        layout.prop(self, "sort_by")
+        layout.prop(self, "select_count")
+        layout.prop(self, "report_count")
+        layout.prop(self, "report_path")
+
+    def execute(self, context):
+        if self.sort_by == "TIME" and not self.use_eval_time:
+            self.report({"ERROR"}, "Evaluation Time is disabled")
+            return {"CANCELLED"}
+
+        profiler.start(self.bl_idname)
+
+        depsgraph = context.evaluated_depsgraph_get()
+        key = self.sort_by.lower()
+        stats = {}
+        counts = {}
+
+        # Instances from geometry nodes, collections and particles are added to their instancer,
+        # evaluated geometry is counted once per data block
+        with profiler.phase("geometry"):
+            for inst in depsgraph.object_instances:
+                ob_eval = inst.object
+                if ob_eval.type not in _geometry_types:
+                    continue
+
+                if (count := counts.get(ob_eval.data)) is None:
+                    count = counts[ob_eval.data] = _counts(ob_eval)
+
+                ob = (inst.parent if inst.is_instance else ob_eval).original
+                if (item := stats.get(ob)) is None:
+                    item = stats[ob] = {"name": ob.name, "verts": 0, "tris": 0, "instances": 0, "time": 0.0}
+
+                item["verts"] += count[0]
+                item["tris"] += count[1]
+                if inst.is_instance:
+                    item["instances"] += 1
+
+        profiler.count("data", len(counts))
+
+        if self.use_eval_time:
+            with profiler.phase("evaluation"):
+                for ob in stats:
+                    ob.update_tag(refresh={"DATA"})
+                    time_start = time.perf_counter()
+                    depsgraph.update()
+                    stats[ob]["time"] = round(time.perf_counter() - time_start, 5)
+
+        with profiler.phase("collections"):
+            coll_stats = []
+
+            # Objects linked to several collections of one subtree are counted once
+            for coll in bpy.data.collections:
+                item = {"name": coll.name, "verts": 0, "tris": 0, "time": 0.0}
+                for ob in coll.all_objects:
+                    if (ob_stats := stats.get(ob)) is not None:
+                        item["verts"] += ob_stats["verts"]
+                        item["tris"] += ob_stats["tris"]
+                        item["time"] += ob_stats["time"]
+                coll_stats.append(item)
+
+        profiler.count("objects", len(stats))
+        profiler.count("collections", len(coll_stats))
+
+        ob_ranked = sorted(stats, key=lambda ob: stats[ob][key], reverse=True)
+        coll_stats.sort(key=lambda x: x[key], reverse=True)
+
+        last["objects"] = [stats[ob] for ob in ob_ranked]
+        last["collections"] = coll_stats
+        last["total"] = {
+            "verts": sum(x["verts"] for x in last["objects"]),
+            "tris": sum(x["tris"] for x in last["objects"]),
+            "time": round(sum(x["time"] for x in last["objects"]), 5),
+        }
+
+        if self.report_path:
+            Path(bpy.path.abspath(self.report_path)).write_text(json.dumps(last, indent=1), encoding="utf-8")
+
+        # Selection
+
+        if self.select_count:
+            for ob in context.selected_objects:
+                ob.select_set(False)
+
+            selected = [ob for ob in ob_ranked[:self.select_count] if ob.visible_get()]
+
+            for ob in selected:
+                ob.select_set(True)
+
+            if selected:
+                context.view_layer.objects.active = selected[0]
+
+        total = last["total"]
+        self.report({"INFO"}, f"{len(stats)} objects, {total['verts']:,} vertices, {total['tris']:,} triangles")
+        self.report({"INFO"}, "Heaviest objects: " + self._ranking(last["objects"], key))
+        self.report({"INFO"}, "Heaviest collections: " + self._ranking(coll_stats, key))
+
+        if (summary := profiler.finish()) is not None:
+            self.report({"INFO"}, f"Profile: {summary}")
+
+        return {"FINISHED"}
+
+    def _ranking(self, items: list[dict], key: str) -> str:
+        if key == "time":
+            return ", ".join(f"{item['name']} {item['time']:.4f} s" for item in items[:self.report_count])
+        return ", ".join(f"{item['name']} {item[key]:,}" for item in items[:self.report_count])
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
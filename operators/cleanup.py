@@ -1,15 +1,23 @@
 # SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import time
+from collections import defaultdict
+
 import bpy
-from bpy.types import Operator
+from bpy.types import ID, Material, Object, Operator, Scene
 
 if bpy.app.version >= (4, 3, 0):  # VER
     from bpy.types import AttributeGroupMesh
 else:
     from bpy.types import AttributeGroup as AttributeGroupMesh
 
-from bpy.props import BoolProperty
+from bpy.props import BoolProperty, EnumProperty, FloatProperty
+
+from ..lib import geometry, modal, orphans, profiler
+from ..lib.deps import DepsIndex
+from ..lib.hierarchy import CollectionIndex
+from ..lib.plan import PlanMixin
 
 
 def _attr_del(attributes: AttributeGroupMesh, attr_names: tuple[str]) -> int:
@@ -21,7 +29,7 @@ def _attr_del(attributes: AttributeGroupMesh, attr_names: tuple[str]) -> int:
     return i
 
 
-class OBJECT_OT_messythings_obdata_del(Operator):
+class OBJECT_OT_messythings_obdata_del(PlanMixin, Operator):
     bl_label = "Remove Object Data"
     bl_description = "Remove object data for selected mesh objects"
     bl_idname = "object.messythings_obdata_del"
@@ -57,91 +65,143 @@ class OBJECT_OT_messythings_obdata_del(Operator):
         col.prop(self, "use_del_skin")
         col.prop(self, "use_del_normals")
 
-    def execute(self, context):
-        obs = context.selected_objects
+        self.draw_plan(layout.column())
 
-        vg_del_count = 0
-        sk_del_count = 0
-        uv_del_count = 0
-        vc_del_count = 0
-        bevel_del_count = 0
-        crease_del_count = 0
-        mask_del_count = 0
-        skin_del_count = 0
-        normals_del_count = 0
+    def plan(self, context) -> modal.Steps:
+        meshes = defaultdict(list)
+        vg_obs = []
 
-        for ob in obs:
-            if ob.type != "MESH":
-                continue
+        # Object
 
-            # Object
+        with profiler.phase("scan objects"):
+            for ob in context.selected_objects:
+                if ob.type != "MESH":
+                    continue
 
-            if self.use_del_vertex_groups and ob.vertex_groups:
-                ob.vertex_groups.clear()
-                vg_del_count += 1
+                meshes[ob.data].append(ob)
 
-            # Data
+                if self.use_del_vertex_groups and ob.vertex_groups:
+                    vg_obs.append(ob)
 
-            ob_data = ob.data
+        # Data
 
-            if self.use_del_shape_keys and ob_data.shape_keys:
-                ob.shape_key_clear()
-                sk_del_count += 1
+        mesh_actions = []
 
-            # Attributes
+        with profiler.phase("scan meshes"):
+            for i, (ob_data, obs) in enumerate(meshes.items()):
+                if not i % modal.CHUNK:
+                    yield "Scanning meshes", i, len(meshes)
 
-            if self.use_del_uv and ob_data.uv_layers:
-                for uv in ob_data.uv_layers:
-                    ob_data.uv_layers.remove(uv)
-                uv_del_count += 1
+                attrs = ob_data.attributes
+                attr_names = {}
+                ops = []
 
-            if self.use_del_vertex_colors and ob_data.color_attributes:
-                for vc in ob_data.color_attributes:
-                    ob_data.color_attributes.remove(vc)
-                vc_del_count += 1
+                if self.use_del_uv:
+                    attr_names["UVs"] = [uv.name for uv in ob_data.uv_layers]
+                if self.use_del_vertex_colors:
+                    attr_names["Vertex Colors"] = [vc.name for vc in ob_data.color_attributes]
+                if self.use_del_bevel:
+                    attr_names["Bevel"] = [x for x in ("bevel_weight_edge", "bevel_weight_vert") if x in attrs]
+                if self.use_del_crease:
+                    attr_names["Crease"] = [x for x in ("crease_edge", "crease_vert") if x in attrs]
 
-            if self.use_del_bevel:
-                bevel_del_count += _attr_del(ob_data.attributes, ("bevel_weight_edge", "bevel_weight_vert"))
+                # Geometry
 
-            if self.use_del_crease:
-                crease_del_count += _attr_del(ob_data.attributes, ("crease_edge", "crease_vert"))
+                if self.use_del_mask:
+                    if ".sculpt_mask" in attrs:
+                        attr_names["Mask"] = [".sculpt_mask"]
+                    else:
+                        with context.temp_override(object=obs[0]):
+                            if bpy.ops.mesh.customdata_mask_clear.poll():
+                                ops.append("Mask")
 
-            # Geometry
+                # No data API for multires mask, skin and custom normals
+                if self.use_del_skin and ob_data.skin_vertices:
+                    ops.append("Skin")
+                if self.use_del_normals and ob_data.has_custom_normals:
+                    ops.append("Normals")
 
-            with context.temp_override(object=ob):
+                attr_names = {k: v for k, v in attr_names.items() if v}
+                use_shape_keys = bool(self.use_del_shape_keys and ob_data.shape_keys)
 
-                if self.use_del_mask and bpy.ops.mesh.customdata_mask_clear.poll():
-                    bpy.ops.mesh.customdata_mask_clear()
-                    mask_del_count += 1
+                if attr_names or ops or use_shape_keys:
+                    mesh_actions.append({
+                        "mesh": ob_data,
+                        "object": obs[0],
+                        "users": len(obs),
+                        "shape_keys": use_shape_keys,
+                        "attributes": attr_names,
+                        "operators": ops,
+                    })
 
-                if self.use_del_skin and ob_data.skin_vertices:
-                    bpy.ops.mesh.customdata_skin_clear()
-                    skin_del_count += 1
+        profiler.count("objects", sum(len(obs) for obs in meshes.values()))
+        profiler.count("meshes", len(meshes))
 
-                if self.use_del_normals and ob_data.has_custom_normals:
-                    bpy.ops.mesh.customdata_custom_splitnormals_clear()
-                    normals_del_count += 1
+        return {"vertex_groups": vg_obs, "meshes": mesh_actions}
+
+    def apply(self, context, actions: dict) -> modal.Steps:
+        vg_del_count = 0
+        obs = actions["vertex_groups"]
+
+        with profiler.phase("vertex groups"):
+            for i, ob in enumerate(obs):
+                if not i % modal.CHUNK:
+                    yield "Removing vertex groups", i, len(obs)
+                ob.vertex_groups.clear()
+                vg_del_count += 1
+                profiler.writes()
+
+        cleaned = {
+            "Shape Keys": [],
+            "UVs": [],
+            "Vertex Colors": [],
+            "Bevel": [],
+            "Crease": [],
+            "Mask": [],
+            "Skin": [],
+            "Normals": [],
+        }
+
+        with profiler.phase("meshes"):
+            for i, action in enumerate(actions["meshes"]):
+                if not i % modal.CHUNK:
+                    yield "Cleaning meshes", i, len(actions["meshes"])
+
+                if (ob_data := action["mesh"]) is None or (ob := action["object"]) is None:
+                    continue
+
+                if action["shape_keys"]:
+                    ob.shape_key_clear()
+                    cleaned["Shape Keys"].append(action["users"])
+                    profiler.writes()
+
+                for category, attr_names in action["attributes"].items():
+                    if _attr_del(ob_data.attributes, attr_names):
+                        cleaned[category].append(action["users"])
+                        profiler.writes(len(attr_names))
+
+                if not action["operators"]:
+                    continue
+
+                with context.temp_override(object=ob):
+                    for category in action["operators"]:
+                        if category == "Mask":
+                            bpy.ops.mesh.customdata_mask_clear()
+                        elif category == "Skin":
+                            bpy.ops.mesh.customdata_skin_clear()
+                        elif category == "Normals":
+                            bpy.ops.mesh.customdata_custom_splitnormals_clear()
+                        cleaned[category].append(action["users"])
+                        profiler.count("operator calls")
 
         msgs = []
 
         if vg_del_count:
-            msgs.append(f"{vg_del_count} Vertex Groups")
-        if sk_del_count:
-            msgs.append(f"{sk_del_count} Shape Keys")
-        if uv_del_count:
-            msgs.append(f"{uv_del_count} UVs")
-        if vc_del_count:
-            msgs.append(f"{vc_del_count} Vertex Colors")
-        if bevel_del_count:
-            msgs.append(f"{bevel_del_count} Bevel")
-        if crease_del_count:
-            msgs.append(f"{crease_del_count} Crease")
-        if mask_del_count:
-            msgs.append(f"{mask_del_count} Mask")
-        if skin_del_count:
-            msgs.append(f"{skin_del_count} Skin")
-        if normals_del_count:
-            msgs.append(f"{normals_del_count} Normals")
+            msgs.append(f"Vertex Groups from {vg_del_count} objects")
+
+        for category, users in cleaned.items():
+            if users:
+                msgs.append(f"{category} from {len(users)} meshes ({sum(users)} objects)")
 
         if not msgs:
             self.report({"INFO"}, "Found nothing to clean up")
@@ -157,16 +217,24 @@ class OBJECT_OT_messythings_obdata_del(Operator):
             self.report({"ERROR"}, "Missing selected objects")
             return {"CANCELLED"}
 
+        self.use_modal = True
         wm = context.window_manager
         return wm.invoke_props_dialog(self)
 
 
-class SCENE_OT_messythings_scene_cleanup(Operator):
+class SCENE_OT_messythings_scene_cleanup(PlanMixin, Operator):
     bl_label = "Clean Up Scene"
     bl_description = "Remove redundant or purge all datablocks of set type"
     bl_idname = "scene.messythings_scene_cleanup"
     bl_options = {"REGISTER", "UNDO"}
 
+    scope: EnumProperty(
+        name="Scope",
+        items=(
+            ("SCENE", "Scene", "Objects of current scene"),
+            ("ALL", "All Scenes", "Objects of every scene, shared objects are scanned once"),
+        ),
+    )
     use_cleanup_objects: BoolProperty(
         name="Objects",
         description=(
@@ -180,6 +248,19 @@ class SCENE_OT_messythings_scene_cleanup(Operator):
         description="Remove Curve, Lattice, Boolean and Shrinkwrap modifiers with empty Object or Target fields",
         default=True,
     )
+    use_cleanup_geometry: BoolProperty(
+        name="Geometry",
+        description="Remove loose vertices, zero area faces and merge coincident vertices in meshes",
+    )
+    merge_distance: FloatProperty(
+        name="Merge Distance",
+        description="Maximum distance between coincident vertices, also minimum face size",
+        default=0.00001,
+        min=0.0000001,
+        step=0.001,
+        precision=6,
+        unit="LENGTH",
+    )
     use_purge_materials: BoolProperty(
         name="Materials",
         description="Purge all materials from file, additionally remove material slots from objects",
@@ -188,8 +269,24 @@ class SCENE_OT_messythings_scene_cleanup(Operator):
         name="Annotations",
         description="Purge all annotations from file"
     )
+    use_purge_orphans: BoolProperty(
+        name="Orphan Data",
+        description=(
+            "Remove datablocks which are not reachable from any scene, "
+            "including data left unused by removed objects"
+        ),
+    )
+    orphan_types: EnumProperty(
+        name="Types",
+        description="Types of orphan datablocks to remove",
+        items=tuple((id_type, data.replace("_", " ").title(), "") for id_type, data in orphans.DATA.items()),
+        options={"ENUM_FLAG"},
+        default={"MESH", "CURVE", "LATTICE", "MATERIAL", "NODETREE", "IMAGE", "TEXTURE"},
+    )
+
+    plan_info = {"scenes"}
 
-    _mod_ob_prop = {
+    _mod_required_prop = {
         "NODES": "node_group",
         "BOOLEAN": "object",
         "CURVE": "object",
@@ -203,114 +300,272 @@ class SCENE_OT_messythings_scene_cleanup(Operator):
         layout.use_property_split = True
         layout.use_property_decorate = False
 
+        layout.prop(self, "scope")
+
         col = layout.column(heading="Redundant", align=True)
         col.prop(self, "use_cleanup_objects")
         col.prop(self, "use_cleanup_modifiers")
+        col.prop(self, "use_cleanup_geometry")
+
+        if self.use_cleanup_geometry:
+            col = layout.column()
+            col.prop(self, "merge_distance")
 
         col = layout.column(heading="Purge", align=True)
         col.prop(self, "use_purge_materials")
         col.prop(self, "use_purge_gpencil")
+        col.prop(self, "use_purge_orphans")
 
-    def execute(self, context):
-        msgs = []
+        if self.use_purge_orphans:
+            col = layout.column()
+            col.prop(self, "orphan_types")
+
+        self.draw_plan(layout.column())
+
+    def get_objects(self) -> tuple[list[Object], dict[Object, frozenset[Scene]] | None]:
+        """:return: Objects in scope, scenes of each object for all scenes scope"""
+        if self.scope == "SCENE":
+            return list(bpy.context.scene.objects), None
+
+        membership = CollectionIndex().scene_membership(bpy.data.objects)
+        return list(membership), membership
+
+    def plan(self, context) -> modal.Steps:
+        actions = {}
+        user_map = None
+
+        with profiler.phase("scope"):
+            obs_all, membership = self.get_objects()
+
+        if self.use_purge_gpencil or self.use_purge_orphans:
+            with profiler.phase("user map"):
+                user_map = bpy.data.user_map()
 
         if self.use_cleanup_objects:
-            curve, lat, mesh = self.cleanup_objects()
-            if curve:
-                msgs.append(f"{curve} curve")
-            if lat:
-                msgs.append(f"{lat} lattice")
-            if mesh:
-                msgs.append(f"{mesh} mesh")
+            with profiler.phase("scan objects"):
+                actions["objects"] = yield from self.cleanup_objects(obs_all)
 
-        if self.use_cleanup_modifiers:
-            mod = self.cleanup_modifiers()
-            if mod:
-                msgs.append(f"{mod} modifiers")
+        # Objects removed first are not touched by later stages
+        removed = set(actions.get("objects", ()))
+        obs_kept = [ob for ob in obs_all if ob not in removed]
 
+        if self.use_cleanup_modifiers:
+            with profiler.phase("scan modifiers"):
+                actions["modifiers"] = yield from self.cleanup_modifiers(obs_kept)
+        if self.use_cleanup_geometry:
+            with profiler.phase("scan geometry"):
+                actions["geometry"] = yield from self.cleanup_geometry(obs_kept, self.merge_distance)
+                actions["geometry_distance"] = self.merge_distance
         if self.use_purge_materials:
-            mat = self.purge_materials()
-            if mat:
-                msgs.append(f"{mat} materials")
-
+            with profiler.phase("scan materials"):
+                actions["material_slots"], actions["materials"] = self.purge_materials(obs_kept)
         if self.use_purge_gpencil:
-            gp = self.purge_gpencil()
-            if gp:
-                msgs.append(f"{gp} annotations")
+            with profiler.phase("scan annotations"):
+                actions["grease_pencils"] = self.purge_gpencil(user_map)
+        if self.use_purge_orphans:
+            with profiler.phase("scan orphans"):
+                removed.update(actions.get("materials", ()), actions.get("grease_pencils", ()))
+                actions["orphans"] = ids = orphans.collect(user_map, self.orphan_types, removed)
+                actions["orphans_size"] = sum(orphans.estimate_size(id) for id in ids)
+
+        profiler.count("objects", len(obs_all))
+
+        if membership is not None:
+            actions["scenes"] = self.scene_totals(membership, actions)
+
+        return actions
+
+    def apply(self, context, actions: dict) -> modal.Steps:
+        msgs = []
+
+        if (obs := actions.get("objects")):
+            with profiler.phase("remove objects"):
+                counts = defaultdict(int)
+                for ob in obs:
+                    counts[ob.type] += 1
+                bpy.data.batch_remove(obs)
+                profiler.count("objects removed", len(obs))
+
+            for ob_type, name in (("CURVE", "curve"), ("LATTICE", "lattice"), ("MESH", "mesh")):
+                if counts[ob_type]:
+                    msgs.append(f"{counts[ob_type]} {name}")
+
+        if (mods := actions.get("modifiers")):
+            count = 0
+            with profiler.phase("remove modifiers"):
+                for ob, mod_name in mods:
+                    if ob is not None and (mod := ob.modifiers.get(mod_name)):
+                        ob.modifiers.remove(mod)
+                        count += 1
+                        profiler.writes()
+            if count:
+                msgs.append(f"{count} modifiers")
+
+        if (meshes := actions.get("geometry")):
+            dist = actions["geometry_distance"]
+            verts = 0
+            faces = 0
+            count = 0
+
+            with profiler.phase("fix geometry"):
+                for i, (me, found) in enumerate(meshes):
+                    if not i % modal.CHUNK:
+                        yield "Cleaning geometry", i, len(meshes)
+                    if me is not None:
+                        verts_removed, faces_removed = geometry.fix(me, found, dist)
+                        verts += verts_removed
+                        faces += faces_removed
+                        count += 1
+                        profiler.writes()
+
+            if verts or faces:
+                msgs.append(f"{verts} vertices and {faces} faces from {count} meshes")
+
+        if "materials" in actions:
+            time_start = time.perf_counter()
+
+            # Clearing data materials also resizes material slots of every object using it
+            with profiler.phase("remove material slots"):
+                for ob in actions["material_slots"]:
+                    if ob.data is not None:
+                        ob.data.materials.clear()
+                        profiler.writes()
+
+            with profiler.phase("remove materials"):
+                mats = actions["materials"]
+                bpy.data.batch_remove(mats)
+
+            if mats:
+                msgs.append(f"{len(mats)} materials in {time.perf_counter() - time_start:.2f} s")
+
+        if (gps := actions.get("grease_pencils")):
+            with profiler.phase("remove annotations"):
+                bpy.data.batch_remove(gps)
+            if gps:
+                msgs.append(f"{len(gps)} annotations")
+
+        if (ids := actions.get("orphans")):
+            with profiler.phase("remove orphans"):
+                bpy.data.batch_remove(ids)
+                profiler.count("orphans removed", len(ids))
+            if ids:
+                msgs.append(f"{len(ids)} orphan datablocks (~{orphans.format_size(actions.get('orphans_size', 0))})")
 
         if not msgs:
             return {"CANCELLED"}
 
+        if context.screen:
+            for area in context.screen.areas:
+                area.tag_redraw()
+
         msg = "Removed: " + ", ".join(msgs)
         self.report({"INFO"}, msg)
 
+        if (totals := actions.get("scenes")):
+            self.report({"INFO"}, "Per scene: " + "; ".join(
+                f"{name} {x['objects']} objects, {x['modifiers']} modifiers"
+                for name, x in totals.items()
+                if x["objects"] or x["modifiers"]
+            ))
+
         return {"FINISHED"}
 
     def invoke(self, context, event):
+        self.use_modal = True
         wm = context.window_manager
         return wm.invoke_props_dialog(self)
 
     @staticmethod
-    def purge_materials() -> int:
-        count = 0
+    def scene_totals(membership: dict[Object, frozenset[Scene]], actions: dict) -> dict[str, dict[str, int]]:
+        """:return: Number of planned object and modifier removals per scene"""
+        totals = {scene.name: {"objects": 0, "modifiers": 0} for scene in bpy.data.scenes}
 
-        for mat in bpy.data.materials:
-            if not mat.is_grease_pencil:
-                bpy.data.materials.remove(mat)
-                count += 1
+        planned = (
+            ("objects", actions.get("objects", ())),
+            ("modifiers", [ob for ob, _ in actions.get("modifiers", ())]),
+        )
 
-        for ob in bpy.context.scene.objects:
-            if ob.type == "GPENCIL":
-                continue
-            if ob.material_slots:
-                with bpy.context.temp_override(object=ob):
-                    for _ in ob.material_slots:
-                        bpy.ops.object.material_slot_remove()
+        for key, obs in planned:
+            for ob in obs:
+                for scene in membership.get(ob, ()):
+                    totals[scene.name][key] += 1
 
-        return count
+        return totals
 
     @staticmethod
-    def purge_gpencil() -> int:
-        count = 0
-        excluded = set()
+    def purge_materials(obs: list[Object]) -> tuple[list[Object], list[Material]]:
+        """:return: One object per unique object data with materials, materials to purge"""
+        ob_datas = {}
 
-        for ob in bpy.context.scene.objects:
+        for ob in obs:
             if ob.type == "GPENCIL":
-                excluded.add(ob.data)
-
-        for gp in bpy.data.grease_pencils:
-            if gp not in excluded:
-                bpy.data.grease_pencils.remove(gp)
-                count += 1
+                continue
+            if ob.material_slots and ob.data is not None and ob.data not in ob_datas:
+                ob_datas[ob.data] = ob
 
-        return count
+        mats = [mat for mat in bpy.data.materials if not mat.is_grease_pencil]
 
-    def cleanup_modifiers(self) -> int:
-        count = 0
+        return list(ob_datas.values()), mats
 
-        for ob in bpy.context.scene.objects:
+    @staticmethod
+    def purge_gpencil(user_map: dict[ID, set[ID]]) -> list[ID]:
+        """:return: Grease pencil data not used by grease pencil objects"""
+        return [
+            gp for gp in bpy.data.grease_pencils
+            if not any(isinstance(user, Object) and user.type == "GPENCIL" for user in user_map.get(gp, ()))
+        ]
+
+    def cleanup_modifiers(self, obs: list[Object]) -> modal.Steps:
+        """:return: Objects and names of modifiers to delete"""
+        mods = []
+
+        for i, ob in enumerate(obs):
+            if not i % modal.CHUNK:
+                yield "Scanning modifiers", i, len(obs)
             if ob.modifiers:
                 for mod in ob.modifiers:
-                    if (prop := self._mod_ob_prop.get(mod.type)) and getattr(mod, prop) is None:
-                        ob.modifiers.remove(mod)
-                        count += 1
+                    if (prop := self._mod_required_prop.get(mod.type)) and getattr(mod, prop) is None:
+                        mods.append([ob, mod.name])
+
+        return mods
+
+    @staticmethod
+    def cleanup_geometry(obs: list[Object], dist: float) -> modal.Steps:
+        """:return: Meshes and their problem counts, for unique meshes of objects"""
+        meshes = {}
+        instancers = set()
+
+        for ob in obs:
+            if ob.type == "MESH" and ob.data.library is None:
+                meshes[ob.data] = None
+                if ob.instance_type != "NONE" or ob.particle_systems:
+                    instancers.add(ob.data)
+
+        # Instancer vertices and faces are placement points, not geometry
+        meshes = [me for me in meshes if me not in instancers]
+        found = []
+
+        for i, me in enumerate(meshes):
+            if not i % modal.CHUNK:
+                yield "Scanning geometry", i, len(meshes)
+            if (problems := geometry.problems(me, dist)):
+                found.append([me, problems])
 
-        return count
+        profiler.count("meshes", len(meshes))
+
+        return found
 
     @staticmethod
-    def cleanup_objects() -> tuple[int, int, int]:
-        """:return: Deleted objects count [CURVE, LATTICE, MESH]"""
+    def cleanup_objects(obs: list[Object]) -> modal.Steps:
+        """:return: Objects to delete, objects used by any object in scope are kept"""
         obs_to_del = set()
-        obs_in_use = set()
-        curve_del_count = 0
-        lat_del_count = 0
-        mesh_del_count = 0
+        index = DepsIndex()
 
         # Get objects
 
-        for ob in bpy.context.scene.objects:
-            ob.hide_viewport = False
-            ob.hide_set(False)
+        for i, ob in enumerate(obs):
+            if not i % modal.CHUNK:
+                yield "Scanning objects", i, len(obs)
 
             if ob.type in {"CURVE", "LATTICE"}:
                 obs_to_del.add(ob)
@@ -329,38 +584,6 @@ class SCENE_OT_messythings_scene_cleanup(Operator):
 
             # Object dependencies
 
-            if ob.modifiers:
-                for mod in ob.modifiers:
-                    if mod.type in {"CURVE", "LATTICE"} and mod.object:
-                        obs_in_use.add(mod.object)
-
-            if ob.constraints:
-                for con in ob.constraints:
-                    if con.type == "FOLLOW_PATH" and con.target:
-                        obs_in_use.add(con.target)
-
-            if ob.type == "CURVE":
-                if ob.data.bevel_object:
-                    obs_in_use.add(ob.data.bevel_object)
-                if ob.data.taper_object:
-                    obs_in_use.add(ob.data.taper_object)
-
-        # Remove objects
-
-        if (obs_rem := obs_to_del - obs_in_use):
-            for ob in obs_rem:
-                if ob.type == "CURVE":
-                    curve_del_count += 1
-                elif ob.type == "LATTICE":
-                    lat_del_count += 1
-                elif ob.type == "MESH":
-                    mesh_del_count += 1
-
-                bpy.data.objects.remove(ob)
-
-        # Report
-
-        for area in bpy.context.screen.areas:
-            area.tag_redraw()
+            index.add(ob)
 
-        return curve_del_count, lat_del_count, mesh_del_count
+        return [ob for ob in obs_to_del if not index.is_used(ob)]
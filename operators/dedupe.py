@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bpy
+from bpy.props import BoolProperty, FloatProperty
+from bpy.types import ID, Operator
+
+from ..lib import fingerprint, meshhash, profiler
+from ..lib.plan import PlanMixin
+
+
+def _survivor(ids: list[ID]) -> ID:
+    """Prefer original name over numbered copies, Metal over Metal.001"""
+    return min(ids, key=lambda id: (id.library is not None, len(id.name), id.name))
+
+
+def _merge(groups: list[list]) -> int:
+    """Remap users of duplicates to survivor and remove duplicates"""
+    dups_all = []
+
+    for survivor, dups in groups:
+        if survivor is None:
+            continue
+        for dup in dups:
+            dup.user_remap(survivor)
+            dups_all.append(dup)
+
+    bpy.data.batch_remove(dups_all)
+    profiler.writes(len(dups_all))
+
+    return len(dups_all)
+
+
+class SCENE_OT_messythings_mesh_dedupe(PlanMixin, Operator):
+    bl_label = "Merge Duplicate Meshes"
+    bl_description = "Find meshes with identical geometry, make their users share one mesh and remove the rest"
+    bl_idname = "scene.messythings_mesh_dedupe"
+    bl_options = {"REGISTER", "UNDO"}
+
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Maximum distance between vertices to consider them matching",
+        default=0.00001,
+        min=0.0000001,
+        step=0.001,
+        precision=6,
+        unit="LENGTH",
+    )
+    use_attributes: BoolProperty(
+        name="Compare Attributes",
+        description="Meshes must also have identical UVs, colors and other attributes",
+        default=True,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "tolerance")
+        layout.prop(self, "use_attributes")
+
+        self.draw_plan(layout.column())
+
+    def plan(self, context) -> dict:
+        # Vertex weights are stored in mesh, but not exposed to bulk reads
+        with profiler.phase("scan objects"):
+            skip = {ob.data for ob in bpy.data.objects if ob.type == "MESH" and ob.vertex_groups}
+            meshes = [me for me in bpy.data.meshes if me.users and me.library is None and me not in skip]
+
+        with profiler.phase("hash"):
+            groups = meshhash.group(meshes, self.tolerance, self.use_attributes)
+
+        profiler.count("meshes", len(meshes))
+        profiler.count("groups", len(groups))
+
+        actions = {"meshes": []}
+
+        for group in groups:
+            survivor = _survivor(group)
+            actions["meshes"].append([survivor, [me for me in group if me is not survivor]])
+
+        return actions
+
+    def apply(self, context, actions: dict) -> set[str]:
+        with profiler.phase("merge"):
+            count = _merge(actions["meshes"])
+
+        if not count:
+            self.report({"INFO"}, "Duplicates not found")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"Merged {count} meshes into {len(actions['meshes'])}")
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+
+class SCENE_OT_messythings_material_dedupe(PlanMixin, Operator):
+    bl_label = "Merge Duplicate Materials"
+    bl_description = (
+        "Find structurally identical materials and node groups (Metal, Metal.001), "
+        "make their users share one datablock and remove the rest"
+    )
+    bl_idname = "scene.messythings_material_dedupe"
+    bl_options = {"REGISTER", "UNDO"}
+
+    use_materials: BoolProperty(name="Materials", default=True)
+    use_node_groups: BoolProperty(name="Node Groups", default=True)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        col = layout.column(heading="Merge", align=True)
+        col.prop(self, "use_materials")
+        col.prop(self, "use_node_groups")
+
+        self.draw_plan(layout.column())
+
+    @staticmethod
+    def _is_local(id: ID) -> bool:
+        return id.library is None and id.asset_data is None
+
+    def plan(self, context) -> dict:
+        actions = {"node_groups": [], "materials": []}
+
+        # Node groups are fingerprinted by structure, materials using copies of same group compare equal
+        if self.use_node_groups:
+            with profiler.phase("node groups"):
+                ngs = [ng for ng in bpy.data.node_groups if self._is_local(ng)]
+                for group in fingerprint.groups(ngs):
+                    survivor = _survivor(group)
+                    actions["node_groups"].append([survivor, [ng for ng in group if ng is not survivor]])
+            profiler.count("node groups", len(ngs))
+
+        if self.use_materials:
+            with profiler.phase("materials"):
+                mats = [mat for mat in bpy.data.materials if self._is_local(mat) and not mat.is_grease_pencil]
+                for group in fingerprint.groups(mats):
+                    survivor = _survivor(group)
+                    actions["materials"].append([survivor, [mat for mat in group if mat is not survivor]])
+            profiler.count("materials", len(mats))
+
+        return actions
+
+    def apply(self, context, actions: dict) -> set[str]:
+        with profiler.phase("merge"):
+            ng_count = _merge(actions["node_groups"])
+            mat_count = _merge(actions["materials"])
+
+        fingerprint.clear()
+
+        if not (ng_count or mat_count):
+            self.report({"INFO"}, "Duplicates not found")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"Merged: {mat_count} materials, {ng_count} node groups")
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
@@ -0,0 +1,204 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+from collections import defaultdict
+
+import bpy
+import numpy as np
+from bpy.props import BoolProperty, IntProperty
+from bpy.types import Image, Operator
+
+from ..lib import orphans, profiler
+from ..lib.plan import PlanMixin
+
+
+_CHUNK = 1 << 24
+
+
+def _pixels(img: Image) -> np.ndarray:
+    width, height = img.size
+    arr = np.empty(width * height * img.channels, dtype=np.float32)
+    img.pixels.foreach_get(arr)
+    return arr
+
+
+def _pixels_hash(img: Image) -> bytes:
+    buf = memoryview(_pixels(img)).cast("B")
+    h = hashlib.blake2b(digest_size=20)
+
+    for i in range(0, len(buf), _CHUNK):
+        h.update(buf[i:i + _CHUNK])
+
+    return h.digest()
+
+
+def _downscale(img: Image, factor: int) -> None:
+    """Box filter by integer factor"""
+    width, height = img.size
+    channels = img.channels
+    w = width // factor
+    h = height // factor
+
+    arr = _pixels(img).reshape(height, width, channels)[:h * factor, :w * factor]
+    arr = arr.reshape(h, factor, w, factor, channels).mean(axis=(1, 3), dtype=np.float32)
+
+    img.scale(w, h)
+    img.pixels.foreach_set(arr.ravel())
+    img.update()
+
+    # Keep result in file, source image on disk is not modified
+    img.pack()
+
+
+class SCENE_OT_messythings_image_audit(PlanMixin, Operator):
+    bl_label = "Audit Images"
+    bl_description = (
+        "Rank images by memory footprint, merge images with identical pixels "
+        "and optionally downscale images over resolution limit"
+    )
+    bl_idname = "scene.messythings_image_audit"
+    bl_options = {"REGISTER", "UNDO"}
+
+    use_dedupe: BoolProperty(
+        name="Merge Duplicates",
+        description="Make users of images with identical pixels share one image and remove the rest",
+        default=True,
+    )
+    use_downscale: BoolProperty(
+        name="Downscale",
+        description="Downscale and pack images with larger side over resolution limit, image files on disk are not changed",
+    )
+    resolution_max: IntProperty(
+        name="Resolution Limit",
+        default=2048,
+        min=64,
+        subtype="PIXEL",
+    )
+    report_count: IntProperty(
+        name="Report Top",
+        description="Number of largest images listed in report and plan",
+        default=20,
+        min=1,
+    )
+
+    plan_info = {"ranking"}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "use_dedupe")
+        layout.prop(self, "use_downscale")
+        sub = layout.column()
+        sub.active = self.use_downscale
+        sub.prop(self, "resolution_max")
+        layout.prop(self, "report_count")
+
+        self.draw_plan(layout.column())
+
+    def plan(self, context) -> dict:
+        imgs = [img for img in bpy.data.images if img.library is None and img.source in {"FILE", "GENERATED"}]
+
+        with profiler.phase("footprint"):
+            sizes = {img: orphans.image_size(img, load=True) for img in imgs}
+
+        profiler.count("images", len(imgs))
+
+        ranked = sorted(sizes, key=sizes.get, reverse=True)[:self.report_count]
+        actions = {
+            "duplicates": [],
+            "downscale": [],
+            "ranking": [[img.name, *img.size, img.users, sizes[img]] for img in ranked],
+            "memory": sum(sizes.values()),
+        }
+
+        self.report({"INFO"}, self._summary(actions))
+
+        # Only images of same shape and color management can be identical
+        if self.use_dedupe:
+            with profiler.phase("hash"):
+                candidates = defaultdict(list)
+                for img in imgs:
+                    if img.has_data:
+                        key = tuple(img.size), img.channels, img.is_float, img.colorspace_settings.name, img.alpha_mode
+                        candidates[key].append(img)
+
+                groups = defaultdict(list)
+                for group in candidates.values():
+                    if len(group) > 1:
+                        for img in group:
+                            groups[_pixels_hash(img)].append(img)
+                            profiler.count("hashed")
+
+            for group in groups.values():
+                if len(group) > 1:
+                    survivor = min(group, key=lambda img: (len(img.name), img.name))
+                    actions["duplicates"].append([survivor, [img for img in group if img is not survivor]])
+
+        if self.use_downscale:
+            merged = {img for _, dups in actions["duplicates"] for img in dups}
+            for img in imgs:
+                if img not in merged and img.has_data and max(img.size) > self.resolution_max:
+                    factor = -(-max(img.size) // self.resolution_max)
+                    actions["downscale"].append([img, factor])
+
+        return actions
+
+    def apply(self, context, actions: dict) -> set[str]:
+        msgs = []
+
+        if actions["duplicates"]:
+            count = 0
+            size = 0
+
+            with profiler.phase("merge"):
+                dups_all = []
+                for survivor, dups in actions["duplicates"]:
+                    if survivor is None:
+                        continue
+                    for dup in dups:
+                        size += orphans.image_size(dup, load=True)
+                        dup.user_remap(survivor)
+                        dups_all.append(dup)
+                bpy.data.batch_remove(dups_all)
+                count = len(dups_all)
+
+            if count:
+                msgs.append(f"merged {count} images (~{orphans.format_size(size)})")
+
+        if actions["downscale"]:
+            count = 0
+            size = 0
+
+            with profiler.phase("downscale"):
+                for img, factor in actions["downscale"]:
+                    if img is not None and img.has_data:
+                        size_before = orphans.image_size(img, load=True)
+                        _downscale(img, factor)
+                        size += size_before - orphans.image_size(img, load=True)
+                        count += 1
+                        profiler.writes()
+
+            if count:
+                msgs.append(f"downscaled {count} images (~{orphans.format_size(size)})")
+
+        if not msgs:
+            self.report({"INFO"}, "Nothing to change")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, "Images: " + ", ".join(msgs))
+
+        return {"FINISHED"}
+
+    @staticmethod
+    def _summary(actions: dict) -> str:
+        return f"Images memory ~{orphans.format_size(actions['memory'])}, largest: " + ", ".join(
+            f"{name} {width}x{height} ~{orphans.format_size(size)}"
+            for name, width, height, _, size in actions["ranking"]
+        )
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
@@ -1,84 +1,80 @@
 # SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import Iterator
+from collections.abc import Sequence
 
 import bpy
-from bpy.props import BoolProperty
-from bpy.types import Collection, Modifier, Object, Operator
+from bpy.props import BoolProperty, EnumProperty
+from bpy.types import Collection, Object, Operator
 
+from ..lib import modal, profiler, rules
+from ..lib.deps import DepsIndex
+from ..lib.hierarchy import CollectionIndex
+from ..lib.plan import PlanMixin
 
-_mod_ob_prop = {
-    "CURVE": "object",
-    "BOOLEAN": "object",
-    "LATTICE": "object",
-    "MESH_DEFORM": "object",
-    "SHRINKWRAP": "target",
-    "ARRAY": "offset_object",
-    "MIRROR": "mirror_object",
-    "SIMPLE_DEFORM": "origin",
-}
 
-
-def _get_collection_objects() -> tuple[Collection, tuple[Object]]:
-    if bpy.context.area.type == "OUTLINER" and bpy.context.selected_ids:
+def _get_collection_objects(index: CollectionIndex) -> tuple[Collection, Sequence[Object]]:
+    if bpy.context.area and bpy.context.area.type == "OUTLINER" and bpy.context.selected_ids:
         for id in bpy.context.selected_ids:
             if id.id_type == "COLLECTION":
-                return bpy.context.collection, tuple(bpy.context.collection.all_objects)
-
-    return bpy.context.scene.collection, tuple(bpy.context.scene.objects)
-
-
-def _ob_from_mod(mod: Modifier) -> Iterator[Object]:
-    if mod.type == "NODES" and mod.node_group:
-        for socket in mod.node_group.interface.items_tree:
-            if socket.socket_type == "NodeSocketObject" and (ob := mod[socket.identifier]):
-                yield ob
+                return bpy.context.collection, tuple(index.all_objects(bpy.context.collection))
 
-    if (prop := _mod_ob_prop.get(mod.type)) and (ob := getattr(mod, prop)):
-        yield ob
+    return bpy.context.scene.collection, bpy.context.scene.objects
 
 
 class SCENE_OT_messythings_deps_select(Operator):
     bl_label = "Select Dependencies"
-    bl_description = "Select objects which are used in modifiers and constraints by currently selected objects"
+    bl_description = (
+        "Select objects which are used in modifiers and constraints by currently selected objects, "
+        "or objects which use currently selected objects"
+    )
     bl_idname = "scene.messythings_deps_select"
     bl_options = {"REGISTER", "UNDO"}
 
+    direction: EnumProperty(
+        name="Direction",
+        items=(
+            ("DEPENDENCIES", "Dependencies", "Select objects used by selected objects, recursively"),
+            ("USERS", "Users", "Select objects using selected objects, recursively"),
+        ),
+    )
+
     def execute(self, context):
+        profiler.start(self.bl_idname)
+
         obs = context.selected_objects
-        dep_obs = set()
+
+        with profiler.phase("index"):
+            index = DepsIndex(context.scene.objects)
+        with profiler.phase("closure"):
+            dep_obs = index.closure(obs, use_users=self.direction == "USERS")
+
+        profiler.count("objects", len(index.deps))
+        profiler.count("selected", len(dep_obs))
 
         for ob in obs:
             ob.select_set(False)
 
-            if ob.modifiers:
-                for mod in ob.modifiers:
-                    for ob_ in _ob_from_mod(mod):
-                        ob_.hide_viewport = False
-                        ob_.hide_set(False)
-                        ob_.select_set(True)
-                        dep_obs.add(ob_)
-
-            if ob.constraints:
-                for con in ob.constraints:
-                    if con.type == "FOLLOW_PATH" and con.target:
-                        con.target.hide_viewport = False
-                        con.target.hide_set(False)
-                        con.target.select_set(True)
-                        dep_obs.add(con.target)
-
         if not dep_obs:
-            self.report({"INFO"}, "Dependencies not found")
+            profiler.finish()
+            self.report({"INFO"}, "Dependencies not found" if self.direction == "DEPENDENCIES" else "Users not found")
             return {"CANCELLED"}
 
+        for ob in dep_obs:
+            ob.hide_viewport = False
+            ob.hide_set(False)
+            ob.select_set(True)
+
         count = len(dep_obs)
 
         for ob in dep_obs:
             context.view_layer.objects.active = ob
             break
 
-        self.report({"INFO"}, f"{count} dependencies selected")
+        self.report({"INFO"}, f"{count} {self.direction.lower()} selected")
+
+        if (summary := profiler.finish()) is not None:
+            self.report({"INFO"}, f"Profile: {summary}")
 
         return {"FINISHED"}
 
@@ -90,9 +86,12 @@ class SCENE_OT_messythings_deps_select(Operator):
         return self.execute(context)
 
 
-class SCENE_OT_messythings_sort(Operator):
+class SCENE_OT_messythings_sort(PlanMixin, Operator):
     bl_label = "Sort by Collections"
-    bl_description = "Sort all objects in the scene in Main, Helpers, Gems, Lights and Gpencil collections"
+    bl_description = (
+        "Sort all objects in the scene in collections by rules set in add-on preferences, "
+        "by default in Main, Helpers, Gems, Lights and Gpencil collections"
+    )
     bl_idname = "scene.messythings_sort"
     bl_options = {"REGISTER", "UNDO"}
 
@@ -102,79 +101,141 @@ class SCENE_OT_messythings_sort(Operator):
         default=True,
     )
 
-    def execute(self, context):
-        parent_coll, obs = _get_collection_objects()
+    plan_info = {"parent", "collections"}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(self, "use_collection_cleanup")
+        self.draw_plan(layout.column())
+
+    def plan(self, context) -> modal.Steps:
+        index = CollectionIndex()
+        parent_coll, obs = _get_collection_objects(index)
 
         if not obs:
             self.report({"ERROR"}, "Objects not found")
+            return None
+
+        with profiler.phase("classify"):
+            sort_rules, fallback = rules.get_rules()
+            ob_targets = rules.classify(obs, sort_rules, fallback)
+
+        profiler.count("objects", len(ob_targets))
+
+        # Target collections, reuse existing ones from previous runs
+
+        names = set(ob_targets.values())
+        children = {coll.name: coll for coll in parent_coll.children}
+        colls = {}
+        colls_new = []
+
+        for name in dict.fromkeys((*(rule.collection for rule in sort_rules), fallback)):
+            if name in names:
+                if (coll := children.get(name)) is None:
+                    colls_new.append(name)
+                colls[name] = coll
+
+        # Relink only objects with changed membership
+
+        relink = []
+
+        with profiler.phase("plan relink"):
+            for i, (ob, name) in enumerate(ob_targets.items()):
+                if not i % modal.CHUNK:
+                    yield "Planning", i, len(ob_targets)
+
+                coll = colls[name]
+                users = set(ob.users_collection)
+
+                if users == {coll}:
+                    continue
+
+                if coll is not None and coll not in users:
+                    index.counts[coll] += 1
+
+                unlink = [coll_ for coll_ in ob.users_collection if coll_ != coll]
+                for coll_ in unlink:
+                    index.counts[coll_] -= 1
+
+                relink.append([ob, name, unlink])
+
+        # Collections left empty after relinking
+
+        with profiler.phase("empty collections"):
+            colls_empty = index.empty_collections({parent_coll}) if self.use_collection_cleanup else ()
+
+        return {
+            "parent": parent_coll,
+            "collections": [[name, coll] for name, coll in colls.items() if coll is not None],
+            "collections_new": colls_new,
+            "unhide": [ob for ob in ob_targets if ob.hide_viewport or ob.hide_get()],
+            "relink": relink,
+            "collections_remove": list(colls_empty),
+        }
+
+    def apply(self, context, actions: dict) -> modal.Steps:
+        if (parent_coll := actions["parent"]) is None:
+            self.report({"ERROR"}, "Collection not found")
             return {"CANCELLED"}
 
         ob_active = context.view_layer.objects.active
-        obs_main = set()
-        obs_gems = set()
-        obs_helpers = set()
-        obs_lights = set()
-        obs_gpencil = set()
 
-        for ob in obs:
-            ob.hide_viewport = False
-            ob.hide_set(False)
-            is_dupliface = False
-
-            if ob.is_instancer:
-                for child in ob.children:
-                    if "gem" in child:
-                        is_dupliface = True
-                        break
-
-            if "gem" in ob or is_dupliface:
-                obs_gems.add(ob)
-            elif (
-                (ob.type == "MESH" and ob.display_type in {"TEXTURED", "SOLID"}) or
-                (ob.type == "CURVE" and (ob.data.bevel_depth or ob.data.bevel_object)) or
-                ob.type in {"FONT", "META"}
-            ):
-                obs_main.add(ob)
-            elif ob.type == "GPENCIL":
-                obs_gpencil.add(ob)
-            elif ob.type in {"LIGHT", "LIGHT_PROBE"}:
-                obs_lights.add(ob)
-            else:
-                obs_helpers.add(ob)
-
-            # Unlink object from existing collections
-
-            for coll in ob.users_collection:
-                coll.objects.unlink(ob)
+        with profiler.phase("unhide"):
+            obs = actions["unhide"]
+            for i, ob in enumerate(obs):
+                if not i % modal.CHUNK:
+                    yield "Unhiding", i, len(obs)
+                if ob.hide_viewport:
+                    ob.hide_viewport = False
+                    profiler.writes()
+                if ob.hide_get():
+                    ob.hide_set(False)
+                    profiler.writes()
 
-        # Clean-up empty collections
+        colls = dict(actions["collections"])
+
+        for name in actions["collections_new"]:
+            coll = colls[name] = bpy.data.collections.new(name)
+            parent_coll.children.link(coll)
+
+        relink_count = 0
+
+        with profiler.phase("relink"):
+            for i, (ob, name, unlink) in enumerate(actions["relink"]):
+                if not i % modal.CHUNK:
+                    yield "Relinking", i, len(actions["relink"])
 
-        if self.use_collection_cleanup:
-            for coll in bpy.data.collections:
-                if coll is not parent_coll and not coll.all_objects:
-                    bpy.data.collections.remove(coll)
-
-        # Link
-
-        for name, obs in (
-            ("Gems", obs_gems),
-            ("Main", obs_main),
-            ("Helpers", obs_helpers),
-            ("Lights", obs_lights),
-            ("Gpensil", obs_gpencil),
-        ):
-            if obs:
-                coll = bpy.data.collections.new(name)
-                parent_coll.children.link(coll)
-                for ob in obs:
+                if ob is None or (coll := colls.get(name)) is None:
+                    continue
+
+                users = set(ob.users_collection)
+
+                if coll not in users:
                     coll.objects.link(ob)
+                    profiler.writes()
+                for coll_ in unlink:
+                    if coll_ in users:
+                        coll_.objects.unlink(ob)
+                        profiler.writes()
+
+                relink_count += 1
+
+        # Clean-up empty collections
+
+        if (colls_empty := actions["collections_remove"]):
+            with profiler.phase("remove collections"):
+                bpy.data.batch_remove(colls_empty)
 
         context.view_layer.objects.active = ob_active
 
-        self.report({"INFO"}, "Sort completed")
+        self.report({"INFO"}, f"Sort completed, {relink_count} objects moved")
 
         return {"FINISHED"}
 
     def invoke(self, context, event):
+        self.use_modal = True
         wm = context.window_manager
         return wm.invoke_props_dialog(self)
@@ -1,19 +1,25 @@
 # SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import heapq
+
 import bpy
-from bpy.props import BoolProperty
+from bpy.props import BoolProperty, IntProperty
 from bpy.types import Object, Operator
 
+from ..lib import estimate, modal, profiler
+from ..lib.hierarchy import CollectionIndex
+from ..lib.plan import PlanMixin
+
 
 def _get_objects() -> list[Object]:
-    if bpy.context.area.type == "OUTLINER":
+    if bpy.context.area and bpy.context.area.type == "OUTLINER":
 
         if bpy.context.selected_ids:
 
             for id in bpy.context.selected_ids:
                 if id.id_type == "COLLECTION":
-                    return bpy.context.collection.all_objects
+                    return CollectionIndex().all_objects(bpy.context.collection)
 
             return bpy.context.selected_objects
 
@@ -24,7 +30,69 @@ def _get_objects() -> list[Object]:
     return bpy.context.scene.objects
 
 
-class SCENE_OT_messythings_normalize(Operator):
+def _budget(obs: list[Object], budget: int) -> tuple[list[list], int, int]:
+    """Lower viewport levels, highest estimated cost object first, until total face count fits budget
+
+    :return: Modifier changes, estimated face count before and after
+    """
+    values = []
+    heap = []
+    total = 0
+
+    for i, ob in enumerate(obs):
+        vals = {
+            mod.name: getattr(mod, prop)
+            for mod in ob.modifiers
+            if mod.show_viewport and (prop := estimate.VIEWPORT_PROP.get(mod.type))
+        }
+        values.append(vals)
+
+        # Base counts of curves and text are not known, their modifiers are left as is
+        if ob.type != "MESH":
+            continue
+
+        faces = estimate.ob_counts(ob, vals).faces
+        total += faces
+        if vals and faces:
+            heap.append((-faces, i))
+
+    total_before = total
+    heapq.heapify(heap)
+
+    while heap and total > budget:
+        faces, i = heapq.heappop(heap)
+        faces = -faces
+        ob = obs[i]
+        vals = values[i]
+        best = None
+
+        # Step down modifier which saves the most
+        for mod_name, value in vals.items():
+            if (value_new := estimate.lower(ob.modifiers[mod_name], value)) is not None:
+                faces_new = estimate.ob_counts(ob, vals | {mod_name: value_new}).faces
+                if best is None or faces_new < best[0]:
+                    best = faces_new, mod_name, value_new
+
+        if best is None or best[0] >= faces:
+            continue
+
+        faces_new, mod_name, vals[mod_name] = best
+        total -= faces - faces_new
+        heapq.heappush(heap, (-faces_new, i))
+
+    mods = []
+
+    for ob, vals in zip(obs, values):
+        for mod_name, value in vals.items():
+            mod = ob.modifiers[mod_name]
+            prop = estimate.VIEWPORT_PROP[mod.type]
+            if getattr(mod, prop) != value:
+                mods.append([ob, mod_name, prop, value])
+
+    return mods, total_before, total
+
+
+class SCENE_OT_messythings_normalize(PlanMixin, Operator):
     bl_label = "Normalize Objects"
     bl_description = "Normalize object properties"
     bl_idname = "scene.messythings_normalize"
@@ -39,6 +107,19 @@ class SCENE_OT_messythings_normalize(Operator):
         name="Rename After Object",
         description="Rename object data after object",
     )
+    use_budget: BoolProperty(
+        name="Polygon Budget",
+        description=(
+            "Lower viewport subdivision levels and screw steps, highest cost objects first, "
+            "until estimated polygon count of objects fits budget, render settings are not changed"
+        ),
+    )
+    budget: IntProperty(
+        name="Budget",
+        description="Maximum estimated number of evaluated faces",
+        default=1_000_000,
+        min=0,
+    )
 
     def draw(self, context):
         layout = self.layout
@@ -51,35 +132,82 @@ class SCENE_OT_messythings_normalize(Operator):
         col = layout.column(heading="Object Data")
         col.prop(self, "use_data_rename")
 
-    def execute(self, context):
-        if not (self.use_data_rename or self.use_mod_match_render):
-            return {"FINISHED"}
+        col = layout.column(heading="Viewport")
+        col.prop(self, "use_budget")
+        sub = col.column()
+        sub.active = self.use_budget
+        sub.prop(self, "budget")
+
+        self.draw_plan(layout.column())
+
+    def plan(self, context) -> modal.Steps:
+        if not (self.use_data_rename or self.use_mod_match_render or self.use_budget):
+            return {"modifiers": [], "rename": [], "budget": []}
 
         obs = _get_objects()
 
         if not obs:
             self.report({"ERROR"}, "Objects not found")
-            return {"CANCELLED"}
+            return None
 
-        mod_count = 0
-        rename_count = 0
+        mods = []
+        renames = []
         ob_datas = set()
 
-        for ob in obs:
+        with profiler.phase("scan"):
+            for i, ob in enumerate(obs):
+                if not i % modal.CHUNK:
+                    yield "Scanning objects", i, len(obs)
 
-            if self.use_mod_match_render and ob.modifiers:
-                for mod in ob.modifiers:
-                    if mod.type == "SCREW" and mod.render_steps != mod.steps:
-                        mod.render_steps = mod.steps
-                        mod_count += 1
-                    if mod.type == "SUBSURF" and mod.render_levels != mod.levels:
-                        mod.render_levels = mod.levels
-                        mod_count += 1
+                if self.use_mod_match_render and ob.modifiers:
+                    for mod in ob.modifiers:
+                        if mod.type == "SCREW" and mod.render_steps != mod.steps:
+                            mods.append([ob, mod.name, "render_steps", mod.steps])
+                        if mod.type == "SUBSURF" and mod.render_levels != mod.levels:
+                            mods.append([ob, mod.name, "render_levels", mod.levels])
+
+                if self.use_data_rename and ob.data and (ob.data not in ob_datas) and (ob.data.name != ob.name):
+                    renames.append(ob)
+                    ob_datas.add(ob.data)
+
+        profiler.count("objects", len(obs))
+        actions = {"modifiers": mods, "rename": renames, "budget": []}
+
+        # Render values are matched to original viewport values above
+        if self.use_budget:
+            with profiler.phase("budget"):
+                actions["budget"], actions["faces_before"], actions["faces_after"] = _budget(obs, self.budget)
+
+        return actions
+
+    def apply(self, context, actions: dict) -> modal.Steps:
+        mod_count = 0
+        rename_count = 0
 
-            if self.use_data_rename and ob.data and (ob.data not in ob_datas) and (ob.data.name != ob.name):
-                ob.data.name = ob.name
-                ob_datas.add(ob.data)
-                rename_count += 1
+        with profiler.phase("modifiers"):
+            for i, (ob, mod_name, prop, value) in enumerate(actions["modifiers"]):
+                if not i % modal.CHUNK:
+                    yield "Modifiers", i, len(actions["modifiers"])
+                if ob is not None and (mod := ob.modifiers.get(mod_name)):
+                    setattr(mod, prop, value)
+                    mod_count += 1
+                    profiler.writes()
+
+        with profiler.phase("rename"):
+            obs = actions["rename"]
+            for i, ob in enumerate(obs):
+                if not i % modal.CHUNK:
+                    yield "Renaming", i, len(obs)
+                if ob.data:
+                    ob.data.name = ob.name
+                    rename_count += 1
+                    profiler.writes()
+
+        with profiler.phase("budget"):
+            for ob, mod_name, prop, value in actions.get("budget", ()):
+                if ob is not None and (mod := ob.modifiers.get(mod_name)):
+                    setattr(mod, prop, value)
+                    profiler.writes()
 
         msgs = []
 
@@ -87,11 +215,15 @@ class SCENE_OT_messythings_normalize(Operator):
             msgs.append(f"{mod_count} Modifiers")
         if self.use_data_rename:
             msgs.append(f"{rename_count} Renamed")
+        if "faces_before" in actions:
+            msgs.append(f"Estimated faces {actions['faces_before']:,} > {actions['faces_after']:,}")
 
-        self.report({"INFO"}, ", ".join(msgs))
+        if msgs:
+            self.report({"INFO"}, ", ".join(msgs))
 
         return {"FINISHED"}
 
     def invoke(self, context, event):
+        self.use_modal = True
         wm = context.window_manager
         return wm.invoke_props_dialog(self)
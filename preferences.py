@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2017-2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bpy
+from bpy.props import BoolProperty, CollectionProperty, EnumProperty, IntProperty, StringProperty
+from bpy.types import AddonPreferences, Operator, PropertyGroup, UIList
+
+from .lib import rules
+
+
+_ob_types = tuple(
+    (item.identifier, item.name, "")
+    for item in bpy.types.Object.bl_rna.properties["type"].enum_items
+)
+_display_types = tuple(
+    (item.identifier, item.name, "")
+    for item in bpy.types.Object.bl_rna.properties["display_type"].enum_items
+)
+
+
+class MessyThingsSortRule(PropertyGroup):
+    collection: StringProperty(name="Collection", description="Target collection name")
+    ob_types: EnumProperty(
+        name="Object Types",
+        description="Match objects of these types, any type if none selected",
+        items=_ob_types,
+        options={"ENUM_FLAG"},
+    )
+    display_types: EnumProperty(
+        name="Display As",
+        description="Match objects with these display types, any if none selected",
+        items=_display_types,
+        options={"ENUM_FLAG"},
+    )
+    prop: StringProperty(name="Custom Property", description="Match objects which have this custom property")
+    use_instancer_children: BoolProperty(
+        name="Instancer Children",
+        description="Also match instancers which have children with the custom property",
+    )
+    use_curve_geometry: BoolProperty(
+        name="Curve Geometry",
+        description="Match only curves with Bevel Depth or Bevel Object",
+    )
+
+
+class PREFERENCES_UL_messythings_sort_rules(UIList):
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        layout.prop(item, "collection", text="", emboss=False, icon="OUTLINER_COLLECTION")
+
+
+class PREFERENCES_OT_messythings_sort_rule_edit(Operator):
+    bl_label = "Edit Sort Rules"
+    bl_description = "Add, remove or reset sort rules"
+    bl_idname = "preferences.messythings_sort_rule_edit"
+    bl_options = {"INTERNAL"}
+
+    action: EnumProperty(
+        items=(
+            ("ADD", "Add", ""),
+            ("REMOVE", "Remove", ""),
+            ("RESET", "Reset", "Replace rules with defaults"),
+        ),
+    )
+
+    def execute(self, context):
+        prefs = context.preferences.addons[__package__].preferences
+        coll = prefs.sort_rules
+
+        if self.action == "ADD":
+            coll.add().collection = "Collection"
+            prefs.sort_rules_index = len(coll) - 1
+
+        elif self.action == "REMOVE":
+            if coll:
+                coll.remove(prefs.sort_rules_index)
+                prefs.sort_rules_index = max(0, prefs.sort_rules_index - 1)
+
+        elif self.action == "RESET":
+            ob_types = {item[0] for item in _ob_types}
+            coll.clear()
+
+            for rule in rules.DEFAULT_RULES:
+                item = coll.add()
+                item.collection = rule.collection
+                item.ob_types = set(rule.ob_types & ob_types)
+                item.display_types = set(rule.display_types)
+                item.prop = rule.prop
+                item.use_instancer_children = rule.use_instancer_children
+                item.use_curve_geometry = rule.use_curve_geometry
+
+            prefs.sort_fallback = rules.DEFAULT_FALLBACK
+            prefs.sort_rules_index = 0
+
+        context.preferences.is_dirty = True
+        return {"FINISHED"}
+
+
+class MessyThingsPreferences(AddonPreferences):
+    bl_idname = __package__
+
+    use_profiling: BoolProperty(
+        name="Profiling",
+        description=(
+            "Report per-phase timings, counters and property writes of operators, "
+            "also written to profile.log in extension user directory. "
+            "Can be enabled with MESSYTHINGS_PROFILE environment variable"
+        ),
+    )
+    sort_rules: CollectionProperty(type=MessyThingsSortRule)
+    sort_rules_index: IntProperty()
+    sort_fallback: StringProperty(
+        name="Other Objects",
+        description="Collection for objects not matched by any rule",
+        default=rules.DEFAULT_FALLBACK,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.label(text="Sort by Collections")
+
+        if not self.sort_rules:
+            layout.label(text="Using built-in rules", icon="INFO")
+
+        row = layout.row()
+        row.template_list("PREFERENCES_UL_messythings_sort_rules", "", self, "sort_rules", self, "sort_rules_index")
+
+        col = row.column(align=True)
+        col.operator("preferences.messythings_sort_rule_edit", text="", icon="ADD").action = "ADD"
+        col.operator("preferences.messythings_sort_rule_edit", text="", icon="REMOVE").action = "REMOVE"
+        col.separator()
+        col.operator("preferences.messythings_sort_rule_edit", text="", icon="LOOP_BACK").action = "RESET"
+
+        if self.sort_rules and 0 <= self.sort_rules_index < len(self.sort_rules):
+            rule = self.sort_rules[self.sort_rules_index]
+
+            col = layout.column()
+            col.prop(rule, "collection")
+            col.prop(rule, "ob_types")
+            col.prop(rule, "display_types")
+            col.prop(rule, "prop")
+
+            col = layout.column(heading="Match")
+            col.prop(rule, "use_instancer_children")
+            col.prop(rule, "use_curve_geometry")
+
+        layout.prop(self, "sort_fallback")
+
+        layout.separator()
+        layout.label(text="Debug")
+        layout.prop(self, "use_profiling")
@@ -19,15 +19,20 @@ class VIEW3D_MT_messythings(Menu):
         layout.operator_context = "INVOKE_DEFAULT"
 
         layout.operator("scene.messythings_normalize")
+        layout.operator("scene.messythings_analyze")
 
         layout.separator()
 
         col = layout.column()
         col.operator("scene.messythings_sort")
         col.operator("scene.messythings_deps_select")
+        col.operator("scene.messythings_deps_select", text="Select Users").direction = "USERS"
 
         layout.separator()
 
         col = layout.column()
         col.operator("scene.messythings_scene_cleanup")
         col.operator("object.messythings_obdata_del")
+        col.operator("scene.messythings_mesh_dedupe")
+        col.operator("scene.messythings_material_dedupe")
+        col.operator("scene.messythings_image_audit")